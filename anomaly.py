@@ -0,0 +1,154 @@
+"""
+Streaming anomaly detection with culprit-process attribution.
+
+Each metric series (total CPU, RAM, per-core CPU, per-interface rates, ...)
+keeps an exponentially weighted mean and variance that is updated in O(1) per
+sample, so the baseline follows what is normal for this host instead of a
+fixed threshold. A sample is anomalous when it sits more than z_threshold
+standard deviations above its baseline.
+
+When an anomaly fires, ProcessDeltaTracker ranks processes by how much their
+CPU time or resident memory changed since the previous tick, which names the
+processes most likely to explain it.
+"""
+
+import math
+import time
+
+
+class EwmaBaseline:
+    """Exponentially weighted running mean / variance of one series."""
+
+    __slots__ = ('alpha', 'mean', 'var', 'count')
+
+    def __init__(self, alpha=0.05):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+
+    @property
+    def std(self):
+        return math.sqrt(self.var)
+
+    def update(self, x):
+        """Fold x into the baseline; return the baseline (mean, std) seen before x."""
+        if self.count == 0:
+            self.mean = x
+            self.count = 1
+            return x, 0.0
+        mean, std = self.mean, math.sqrt(self.var)
+        diff = x - mean
+        incr = self.alpha * diff
+        self.mean = mean + incr
+        self.var = (1.0 - self.alpha) * (self.var + diff * incr)
+        self.count += 1
+        return mean, std
+
+
+class AnomalyDetector:
+    """Flag samples that deviate from their per-metric EWMA baseline.
+
+    An anomaly is reported once when a metric goes above z_threshold and again
+    only after it has dropped back under clear_z. min_std keeps near-constant
+    series (e.g. disk usage) from alerting on tiny wiggles.
+    """
+
+    def __init__(self, alpha=0.05, z_threshold=3.0, clear_z=1.5, warmup=30, min_std=1.0):
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.clear_z = clear_z
+        self.warmup = warmup
+        self.min_std = min_std
+        self.baselines = {}
+        self.active = set()
+
+    def reset(self):
+        self.baselines.clear()
+        self.active.clear()
+
+    def update(self, metrics):
+        """Feed one sample of {metric: value}; return newly raised anomalies.
+
+        Each anomaly is a dict with metric, value, mean, std and z.
+        """
+        anomalies = []
+        for metric, value in metrics.items():
+            if value is None:
+                continue
+            baseline = self.baselines.get(metric)
+            if baseline is None:
+                baseline = self.baselines[metric] = EwmaBaseline(self.alpha)
+            warmed_up = baseline.count >= self.warmup
+            mean, std = baseline.update(value)
+            if not warmed_up:
+                continue
+            z = (value - mean) / max(std, self.min_std)
+            if z >= self.z_threshold:
+                if metric not in self.active:
+                    self.active.add(metric)
+                    anomalies.append({'metric': metric, 'value': value, 'mean': mean, 'std': std, 'z': z})
+            elif z < self.clear_z:
+                self.active.discard(metric)
+        return anomalies
+
+
+class ProcessDeltaTracker:
+    """Per-process CPU time / RSS deltas between consecutive process snapshots."""
+
+    def __init__(self):
+        self.previous = {}
+        self.deltas = {}
+        self.last_time = None
+
+    def update(self, procs, now=None):
+        """Take a snapshot from process_iter() info dicts with 'cpu_times' and 'memory_info'.
+
+        Processes are matched on (pid, create_time) so a reused PID starts
+        fresh instead of producing a bogus delta against the old process.
+        'cpu_num' (the core a process last ran on, where psutil supports it)
+        is kept for attributing per-core anomalies.
+        """
+        now = time.monotonic() if now is None else now
+        elapsed = (now - self.last_time) if self.last_time is not None else 0.0
+        current = {}
+        deltas = {}
+        for info in procs:
+            pid = info.get('pid')
+            cpu_times = info.get('cpu_times')
+            mem_info = info.get('memory_info')
+            cpu = (cpu_times.user + cpu_times.system) if cpu_times else 0.0
+            rss = mem_info.rss if mem_info else 0
+            key = (pid, info.get('create_time'))
+            current[key] = (info.get('name') or '', cpu, rss)
+            prev = self.previous.get(key)
+            if prev is not None and elapsed > 0:
+                # CPU delta as percent of one core over the interval
+                deltas[pid] = (current[key][0], (cpu - prev[1]) / elapsed * 100.0, rss - prev[2],
+                               info.get('cpu_num'))
+        self.previous = current
+        self.deltas = deltas
+        self.last_time = now
+
+    def culprits(self, metric, top_n=3):
+        """Return [(pid, name, delta, share)] of processes that best explain metric.
+
+        CPU metrics are ranked by CPU time delta; for cpu_core_N only the
+        processes last seen on core N count (none without cpu_num). Memory
+        metrics are ranked by RSS growth in bytes. Other metrics have no
+        per-process counterpart and return an empty list.
+        """
+        core = None
+        if metric.startswith('cpu_core_'):
+            index, core = 1, int(metric[len('cpu_core_'):])
+        elif metric.startswith('cpu'):
+            index = 1
+        elif metric.startswith('mem'):
+            index = 2
+        else:
+            return []
+        ranked = sorted(((pid, d[0], d[index]) for pid, d in self.deltas.items()
+                         if d[index] > 0 and (core is None or d[3] == core)),
+                        key=lambda item: item[2], reverse=True)
+        total = sum(item[2] for item in ranked) or 1
+        return [(pid, name, delta, delta / total) for pid, name, delta in ranked[:top_n]]
@@ -0,0 +1,237 @@
+"""
+cgroup v2 (unified hierarchy) resource aggregation per container / service.
+
+CgroupCollector reads cpu.stat, memory.current and io.stat straight from each
+cgroup directory and turns the counters into rates between samples. Tree
+changes are detected from nr_descendants in cgroup.stat (cgroupfs does not
+update directory mtimes): while the root's count is unchanged nothing is
+rescanned; when it moves, only the cgroups whose direct children changed are
+re-walked. A full rescan every full_rescan_s seconds catches a create and a
+remove cancelling out between samples. A steady-state sample therefore never
+walks the tree or the process list. PID to cgroup mapping comes from each
+cgroup's cgroup.procs and is refreshed on a slower cadence.
+
+Linux only; available() is False when no cgroup v2 hierarchy is mounted.
+"""
+
+import os
+import re
+import time
+
+CANDIDATE_ROOTS = ('/sys/fs/cgroup', '/sys/fs/cgroup/unified')
+
+_SCOPE_PATTERNS = (
+    (re.compile(r'docker-([0-9a-f]{12})[0-9a-f]*\.scope$'), 'docker'),
+    (re.compile(r'libpod-([0-9a-f]{12})[0-9a-f]*\.scope$'), 'podman'),
+    (re.compile(r'cri-containerd-([0-9a-f]{12})[0-9a-f]*\.scope$'), 'containerd'),
+    (re.compile(r'crio-([0-9a-f]{12})[0-9a-f]*\.scope$'), 'cri-o'),
+)
+
+
+def find_root():
+    """Return the cgroup v2 mount point, or None."""
+    for root in CANDIDATE_ROOTS:
+        if os.path.isfile(os.path.join(root, 'cgroup.controllers')):
+            return root
+    return None
+
+
+def available():
+    return find_root() is not None
+
+
+def friendly_name(rel_path):
+    """Short container / service label for a cgroup path relative to the root."""
+    if rel_path in ('', '/'):
+        return '(root)'
+    leaf = rel_path.rstrip('/').rsplit('/', 1)[-1]
+    for pattern, runtime in _SCOPE_PATTERNS:
+        match = pattern.search(leaf)
+        if match:
+            return f'{runtime}:{match.group(1)}'
+    for suffix in ('.service', '.scope', '.slice'):
+        if leaf.endswith(suffix):
+            return leaf[:-len(suffix)]
+    return leaf
+
+
+def _is_under(rel, ancestor):
+    return ancestor == '' or rel == ancestor or rel.startswith(ancestor + '/')
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def read_cpu_usec(path):
+    text = _read(os.path.join(path, 'cpu.stat'))
+    if text:
+        for line in text.splitlines():
+            if line.startswith('usage_usec '):
+                return int(line.split()[1])
+    return None
+
+
+def read_memory(path):
+    text = _read(os.path.join(path, 'memory.current'))
+    return int(text) if text and text.strip().isdigit() else None
+
+
+def read_io_bytes(path):
+    """Sum rbytes / wbytes over all devices in io.stat."""
+    text = _read(os.path.join(path, 'io.stat'))
+    if text is None:
+        return None
+    rbytes = wbytes = 0
+    for line in text.splitlines():
+        for field in line.split()[1:]:
+            key, _, value = field.partition('=')
+            if key == 'rbytes':
+                rbytes += int(value)
+            elif key == 'wbytes':
+                wbytes += int(value)
+    return rbytes, wbytes
+
+
+def read_descendants(path):
+    """nr_descendants from cgroup.stat, or None if the cgroup is gone."""
+    text = _read(os.path.join(path, 'cgroup.stat'))
+    if text:
+        for line in text.splitlines():
+            if line.startswith('nr_descendants '):
+                return int(line.split()[1])
+    return None
+
+
+def _parent(rel):
+    return rel.rsplit('/', 1)[0] if '/' in rel else ''
+
+
+def read_pids(path):
+    text = _read(os.path.join(path, 'cgroup.procs'))
+    return [int(pid) for pid in text.split()] if text else []
+
+
+class CgroupCollector:
+    """Sample per-cgroup CPU, memory and I/O rates from the cgroup v2 tree."""
+
+    def __init__(self, root=None, pid_refresh_s=5.0, full_rescan_s=60.0):
+        self.root = root or find_root()
+        self.pid_refresh_s = pid_refresh_s
+        self.full_rescan_s = full_rescan_s
+        self.dirs = {}        # rel path -> nr_descendants when last scanned
+        self.previous = {}    # rel path -> (monotonic time, cpu usec, rbytes, wbytes)
+        self.stats = {}       # rel path -> dict of latest values / rates
+        self.pids = {}        # rel path -> [pid, ...]
+        self.pid_cgroups = {} # pid -> rel path
+        self.rescans = 0
+        self._pids_at = None
+        self._root_descendants = None
+        self._full_scan_at = None
+        if self.root:
+            self._scan('')
+
+    def _abs(self, rel):
+        return os.path.join(self.root, rel) if rel else self.root
+
+    def _scan(self, rel):
+        """(Re)discover rel and everything below it."""
+        self.rescans += 1
+        if rel == '':
+            self._full_scan_at = time.monotonic()
+        for key in [k for k in self.dirs if _is_under(k, rel)]:
+            del self.dirs[key]
+        for dirpath, dirnames, _files in os.walk(self._abs(rel)):
+            count = read_descendants(dirpath)
+            if count is None:
+                dirnames[:] = []
+                continue
+            key = os.path.relpath(dirpath, self.root).replace(os.sep, '/')
+            self.dirs['' if key == '.' else key] = count
+        self._root_descendants = read_descendants(self.root)
+
+    def _refresh_tree(self):
+        if self._full_scan_at is None or time.monotonic() - self._full_scan_at >= self.full_rescan_s:
+            self._scan('')
+        elif read_descendants(self.root) != self._root_descendants:
+            # a cgroup's direct children changed when its nr_descendants no longer
+            # equals the sum over its known children (each child plus its descendants)
+            counts = {rel: read_descendants(self._abs(rel)) for rel in self.dirs}
+            expected = dict.fromkeys(self.dirs, 0)
+            changed = set()
+            for rel, count in counts.items():
+                if rel == '':
+                    continue
+                if count is None:
+                    changed.add(_parent(rel))
+                elif _parent(rel) in expected:
+                    expected[_parent(rel)] += count + 1
+            for rel, count in counts.items():
+                if count is not None and count != expected[rel]:
+                    changed.add(rel)
+            # rescan only the topmost changed cgroups
+            for rel in changed:
+                if not any(other != rel and _is_under(rel, other) for other in changed):
+                    self._scan(rel)
+            self._root_descendants = read_descendants(self.root)
+        for stale in set(self.previous) - set(self.dirs):
+            del self.previous[stale]
+            self.pids.pop(stale, None)
+
+    def refresh_pids(self):
+        """Re-read cgroup.procs for every cgroup."""
+        self.pids = {rel: read_pids(self._abs(rel)) for rel in self.dirs}
+        self.pid_cgroups = {pid: rel for rel, pids in self.pids.items() for pid in pids}
+        self._pids_at = time.monotonic()
+
+    def update_pids(self):
+        """Refresh the PID map once pid_refresh_s has passed; cheap to call every tick."""
+        if not self.root:
+            return
+        if self._pids_at is None or time.monotonic() - self._pids_at >= self.pid_refresh_s:
+            self._refresh_tree()
+            self.refresh_pids()
+
+    def cgroup_of(self, pid):
+        """Relative cgroup path of pid as of the last PID refresh, or None."""
+        return self.pid_cgroups.get(pid)
+
+    def sample(self):
+        """Take one sample; returns {rel path: stats dict}."""
+        if not self.root:
+            return {}
+        self._refresh_tree()
+        now = time.monotonic()
+        if self._pids_at is None or now - self._pids_at >= self.pid_refresh_s:
+            self.refresh_pids()
+        stats = {}
+        for rel in self.dirs:
+            path = self._abs(rel)
+            cpu = read_cpu_usec(path)
+            io = read_io_bytes(path)
+            rbytes, wbytes = io if io else (None, None)
+            entry = {
+                'name': friendly_name(rel),
+                'path': '/' + rel,
+                'memory': read_memory(path),
+                'cpu_percent': None,
+                'read_bps': None,
+                'write_bps': None,
+                'pids': len(self.pids.get(rel, ())),
+            }
+            prev = self.previous.get(rel)
+            if prev is not None:
+                elapsed = max(now - prev[0], 1e-6)
+                if cpu is not None and prev[1] is not None:
+                    entry['cpu_percent'] = (cpu - prev[1]) / (elapsed * 1e6) * 100.0
+                if rbytes is not None and prev[2] is not None:
+                    entry['read_bps'] = (rbytes - prev[2]) / elapsed
+                    entry['write_bps'] = (wbytes - prev[3]) / elapsed
+            self.previous[rel] = (now, cpu, rbytes, wbytes)
+            stats[rel] = entry
+        self.stats = stats
+        return stats
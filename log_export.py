@@ -0,0 +1,246 @@
+"""
+Streaming export of monitor logs to CSV, JSON lines and Excel (xlsx).
+
+Rows are pulled one at a time from a generator (in-memory samples or an
+on-disk system_log_*.csv), filtered by time range and column, and written
+straight to the output file, so memory use does not grow with the size of the
+log. export_in_background() runs the whole pipeline in a worker thread with
+progress reporting and cancellation.
+
+Excel export uses openpyxl's write-only mode (pip install openpyxl), which
+streams rows to disk instead of building the workbook in memory; exports
+longer than Excel's 1,048,576-row sheet limit continue on further sheets.
+"""
+
+import csv
+import datetime
+import json
+import os
+import threading
+
+try:
+    import openpyxl
+except ImportError:  # optional, only needed for .xlsx
+    openpyxl = None
+
+
+# rows per worksheet in the xlsx format, header included
+XLSX_MAX_ROWS = 1048576
+
+FORMATS = {
+    'csv': ('CSV files', '.csv'),
+    'jsonl': ('JSON lines', '.jsonl'),
+    'xlsx': ('Excel workbook', '.xlsx'),
+}
+
+
+class ExportCancelled(Exception):
+    """Raised inside the export loop when the caller asked to stop."""
+
+
+def parse_timestamp(value):
+    """Parse the timestamp formats written by the monitors; None if unparseable."""
+    if isinstance(value, datetime.datetime):
+        return value
+    try:
+        return datetime.datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+
+
+def is_header_row(fields, header):
+    """True for a copy of the header inside a log (written after each "Start Logging")."""
+    return list(fields) == list(header)
+
+
+def find_timestamp_key(columns):
+    for col in columns:
+        if col.strip().lower() == 'timestamp':
+            return col
+    return None
+
+
+def read_csv_header(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return next(csv.reader(f), [])
+
+
+def _checkpoint(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ExportCancelled()
+
+
+def iter_csv_log(path, progress=None, cancel_event=None, every=1000):
+    """Yield rows of a CSV log as dicts without loading the file.
+
+    Every `every` rows read (whether or not a filter later drops them)
+    progress(fraction) is called with the share of the file read so far and
+    ExportCancelled is raised if cancel_event is set.
+    """
+    size = os.path.getsize(path) or 1
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for i, row in enumerate(reader):
+            if i % every == 0:
+                _checkpoint(cancel_event)
+                if progress:
+                    progress(min(1.0, f.buffer.tell() / size))
+            # a header row repeated after each "Start Logging" is not data
+            if reader.fieldnames and is_header_row(row.values(), reader.fieldnames):
+                continue
+            yield row
+    if progress:
+        progress(1.0)
+
+
+def iter_samples(samples, progress=None, cancel_event=None, every=1000):
+    """Yield rows from an in-memory list of sample dicts (see iter_csv_log)."""
+    total = len(samples) or 1
+    for i, row in enumerate(samples):
+        if i % every == 0:
+            _checkpoint(cancel_event)
+            if progress:
+                progress(i / total)
+        yield row
+    if progress:
+        progress(1.0)
+
+
+def filter_rows(rows, columns=None, start=None, end=None, timestamp_key=None):
+    """Restrict rows to [start, end] and to the given columns (in that order)."""
+    for row in rows:
+        if timestamp_key and (start or end):
+            ts = parse_timestamp(row.get(timestamp_key))
+            if ts is None:
+                continue
+            if start and ts < start:
+                continue
+            if end and ts > end:
+                continue
+        if columns:
+            row = {c: row.get(c) for c in columns}
+        yield row
+
+
+def _coerce(value):
+    # CSV logs hold everything as text; keep numbers numeric in JSON / xlsx
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return value
+    return value
+
+
+def _write_csv(rows, path, columns, check):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            check()
+            writer.writerow(row)
+
+
+def _write_jsonl(rows, path, columns, check):
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            check()
+            f.write(json.dumps({c: _coerce(row.get(c)) for c in columns}))
+            f.write('\n')
+
+
+def _write_xlsx(rows, path, columns, check):
+    # write-only mode does not enforce Excel's row limit, so continue on a
+    # new sheet (log, log 2, ...) before a sheet would overflow
+    if openpyxl is None:
+        raise RuntimeError('Excel export needs openpyxl (pip install openpyxl).')
+    wb = openpyxl.Workbook(write_only=True)
+    ws, sheet_rows, sheets = None, XLSX_MAX_ROWS, 0
+    for row in rows:
+        check()
+        if sheet_rows >= XLSX_MAX_ROWS:
+            sheets += 1
+            ws = wb.create_sheet('log' if sheets == 1 else f'log {sheets}')
+            ws.append(columns)
+            sheet_rows = 1
+        ws.append([_coerce(row.get(c)) for c in columns])
+        sheet_rows += 1
+    if ws is None:
+        wb.create_sheet('log').append(columns)
+    wb.save(path)
+
+
+WRITERS = {'csv': _write_csv, 'jsonl': _write_jsonl, 'xlsx': _write_xlsx}
+
+
+def export_rows(rows, path, fmt, columns, cancel_event=None, on_row=None):
+    """Write rows to path in the given format; returns the number of rows written.
+
+    Raises ExportCancelled (after removing the partial file) if cancel_event
+    gets set while exporting.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f'Unsupported export format: {fmt}')
+    count = 0
+
+    def check():
+        nonlocal count
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        count += 1
+        if on_row:
+            on_row(count)
+
+    try:
+        WRITERS[fmt](rows, path, list(columns), check)
+    except BaseException:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def export_in_background(source, path, fmt, columns, start=None, end=None,
+                         on_progress=None, on_done=None):
+    """Export source (a CSV log path or a list of sample dicts) in a worker thread.
+
+    on_progress(rows_written, fraction) (every 1000 source rows read) and
+    on_done(rows_written, error) are called from the worker thread; error is None on success or an
+    ExportCancelled / other exception. Returns (thread, cancel_event).
+    """
+    cancel_event = threading.Event()
+    state = {'count': 0}
+
+    def on_read(fraction):
+        # reported per rows read, so progress moves even when the filter drops everything
+        if on_progress:
+            on_progress(state['count'], fraction)
+
+    def on_row(count):
+        state['count'] = count
+
+    def worker():
+        count, error = 0, None
+        try:
+            if isinstance(source, (str, os.PathLike)):
+                rows = iter_csv_log(source, on_read, cancel_event)
+                ts_key = find_timestamp_key(read_csv_header(source))
+            else:
+                samples = list(source)
+                rows = iter_samples(samples, on_read, cancel_event)
+                ts_key = find_timestamp_key(samples[0].keys()) if samples else None
+            rows = filter_rows(rows, columns, start, end, ts_key)
+            count = export_rows(rows, path, fmt, columns, cancel_event, on_row)
+        except BaseException as e:
+            error = e
+        if on_done:
+            on_done(count, error)
+
+    thread = threading.Thread(target=worker, name='log-export', daemon=True)
+    thread.start()
+    return thread, cancel_event
@@ -0,0 +1,232 @@
+"""
+Sparse index and screen-resolution downsampling for large CSV logs.
+
+LogIndex memory-maps a system_log_*.csv and makes one streaming pass over it,
+recording for every block of block_rows lines the byte offset, first/last
+timestamp and, per numeric column, the min and max (with their timestamps).
+Nothing else is kept in memory.
+
+query(start, end, buckets) returns at most two points (the min and the max)
+per bucket, which keeps spikes visible at any zoom level. Wide ranges are
+answered from the block summaries alone; once a bucket covers only a few
+blocks, just the rows between the matching block offsets are read back from
+the mapped file.
+"""
+
+import bisect
+import csv
+import math
+import mmap
+from array import array
+
+from log_export import is_header_row, parse_timestamp
+
+NAN = float('nan')
+
+
+def _parse_float(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return NAN
+
+
+class LogIndex:
+    """Block index over a time-ordered CSV log (first column or 'Timestamp')."""
+
+    def __init__(self, path, block_rows=64):
+        self.path = path
+        self.block_rows = block_rows
+        self.file = open(path, 'rb')
+        self.size = self.file.seek(0, 2)
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        header_line = self.mm[:self.mm.find(b'\n')] if self.size else b''
+        self.columns = next(csv.reader([header_line.decode('utf-8', 'replace')]), [])
+        ts_cols = [i for i, c in enumerate(self.columns) if c.strip().lower() == 'timestamp']
+        self.ts_col = ts_cols[0] if ts_cols else 0
+        self.value_cols = [i for i in range(len(self.columns)) if i != self.ts_col]
+
+        self.offsets = array('q')   # byte offset of each block's first line
+        self.starts = array('d')    # first timestamp per block
+        self.ends = array('d')      # last timestamp per block
+        self.counts = array('l')    # rows per block
+        # per column and block: min / max value and when it occurred
+        self.min_v = {i: array('d') for i in self.value_cols}
+        self.min_t = {i: array('d') for i in self.value_cols}
+        self.max_v = {i: array('d') for i in self.value_cols}
+        self.max_t = {i: array('d') for i in self.value_cols}
+        self.rows = 0
+        self.built = False
+
+    @property
+    def numeric_columns(self):
+        """Names of the columns that had at least one numeric value."""
+        return [self.columns[i] for i in self.value_cols
+                if any(not math.isnan(v) for v in self.max_v[i])]
+
+    def build(self, progress=None, cancel_event=None):
+        """Scan the file once; progress(fraction) is called every few thousand rows."""
+        if not self.size:
+            self.built = True
+            return
+        mm = self.mm
+        pos = mm.find(b'\n') + 1
+        mm.seek(pos)
+        block = None
+        readline = mm.readline
+        while True:
+            offset = pos
+            line = readline()
+            if not line:
+                break
+            pos += len(line)
+            row = self._split(line)
+            if row is None:
+                continue
+            ts, values = row
+            if block is None or block['count'] >= self.block_rows:
+                if block is not None:
+                    self._close_block(block)
+                    if len(self.offsets) % 64 == 0:
+                        if progress:
+                            progress(pos / self.size)
+                        if cancel_event is not None and cancel_event.is_set():
+                            return
+                block = {'offset': offset, 'start': ts, 'end': ts, 'count': 0,
+                         'min': {i: (NAN, ts) for i in self.value_cols},
+                         'max': {i: (NAN, ts) for i in self.value_cols}}
+            block['end'] = ts
+            block['count'] += 1
+            for i, v in values.items():
+                if math.isnan(v):
+                    continue
+                cur = block['min'][i][0]
+                if math.isnan(cur) or v < cur:
+                    block['min'][i] = (v, ts)
+                cur = block['max'][i][0]
+                if math.isnan(cur) or v > cur:
+                    block['max'][i] = (v, ts)
+        if block is not None:
+            self._close_block(block)
+        self.built = True
+        if progress:
+            progress(1.0)
+
+    def _close_block(self, block):
+        self.offsets.append(block['offset'])
+        self.starts.append(block['start'])
+        self.ends.append(block['end'])
+        self.counts.append(block['count'])
+        self.rows += block['count']
+        for i in self.value_cols:
+            value, ts = block['min'][i]
+            self.min_v[i].append(value)
+            self.min_t[i].append(ts)
+            value, ts = block['max'][i]
+            self.max_v[i].append(value)
+            self.max_t[i].append(ts)
+
+    def _split(self, line, cols=None):
+        """Parse one raw line into (timestamp, {col: value}); None for headers / junk."""
+        cols = self.value_cols if cols is None else cols
+        line = line.rstrip(b'\r\n')
+        if not line:
+            return None
+        fields = line.decode('utf-8', 'replace').split(',')
+        if len(fields) <= self.ts_col or is_header_row(fields, self.columns):
+            return None
+        # same timestamp formats as the exporter accepts
+        ts = parse_timestamp(fields[self.ts_col])
+        if ts is None:
+            return None
+        return ts.timestamp(), {i: _parse_float(fields[i]) if i < len(fields) else NAN for i in cols}
+
+    @property
+    def time_range(self):
+        if not self.starts:
+            return None, None
+        return self.starts[0], self.ends[-1]
+
+    def _block_range(self, start, end):
+        first = min(bisect.bisect_left(self.ends, start), len(self.starts) - 1)
+        last = max(first, bisect.bisect_right(self.starts, end) - 1)
+        return first, last
+
+    def query(self, columns, start=None, end=None, buckets=1000):
+        """Return {column name: (xs, ys)} downsampled to about 2 * buckets points."""
+        result = {name: ([], []) for name in columns}
+        if not self.starts:
+            return result
+        lo, hi = self.time_range
+        start = lo if start is None else max(start, lo)
+        end = hi if end is None else min(end, hi)
+        if end <= start:
+            end = start + 1
+        buckets = max(1, int(buckets))
+        width = (end - start) / buckets
+        first, last = self._block_range(start, end)
+        cols = [self.columns.index(name) for name in columns]
+
+        # a bucket spanning several blocks can be answered from the summaries
+        block_span = (self.ends[last] - self.starts[first]) / max(1, last - first + 1)
+        if width >= block_span and last - first > 1:
+            # partial blocks at the edges are read exactly, the rest comes from the index
+            points = self._read_rows(first, first, cols, start, end)
+            for b in range(first + 1, last):
+                for i in cols:
+                    points[i].append((self.min_v[i][b], self.min_t[i][b]))
+                    points[i].append((self.max_v[i][b], self.max_t[i][b]))
+            for i, tail in self._read_rows(last, last, cols, start, end).items():
+                points[i].extend(tail)
+        else:
+            points = self._read_rows(first, last, cols, start, end)
+
+        for name, i in zip(columns, cols):
+            xs, ys = _minmax_buckets(points[i], start, width, buckets)
+            result[name] = (xs, ys)
+        return result
+
+    def _read_rows(self, first, last, cols, start, end):
+        begin = self.offsets[first]
+        stop = self.offsets[last + 1] if last + 1 < len(self.offsets) else self.size
+        points = {i: [] for i in cols}
+        for line in self.mm[begin:stop].split(b'\n'):
+            row = self._split(line, cols)
+            if row is None:
+                continue
+            ts, values = row
+            if ts < start or ts > end:
+                continue
+            for i in cols:
+                points[i].append((values[i], ts))
+        return points
+
+    def close(self):
+        if self.size:
+            self.mm.close()
+        self.file.close()
+
+
+def _minmax_buckets(points, start, width, buckets):
+    """Keep the min and max (value, ts) point of each time bucket, in time order."""
+    lows = [None] * buckets
+    highs = [None] * buckets
+    for value, ts in points:
+        if math.isnan(value):
+            continue
+        b = min(buckets - 1, max(0, int((ts - start) / width)))
+        low = lows[b]
+        if low is None or value < low[0]:
+            lows[b] = (value, ts)
+        high = highs[b]
+        if high is None or value > high[0]:
+            highs[b] = (value, ts)
+    xs, ys = [], []
+    for low, high in zip(lows, highs):
+        if low is None:
+            continue
+        pair = sorted({(low[1], low[0]), (high[1], high[0])})
+        for ts, value in pair:
+            xs.append(ts)
+            ys.append(value)
+    return xs, ys
@@ -0,0 +1,104 @@
+"""
+Budgeted background USS / PSS accounting.
+
+memory_percent is RSS based and counts shared pages once per process, which
+overstates memory for anything sharing libraries or fork()ed heaps. USS
+(unique pages) and PSS (proportional share) from memory_full_info() are
+accurate but read /proc/<pid>/smaps, which is too slow to do for every
+process every tick.
+
+MemoryAccountant measures in a background thread within a fixed time budget
+per cycle: the top_n processes by RSS first, then the rest, stalest first,
+so over several cycles every process gets measured. Results are cached with
+the time they were taken so the table can show how old each value is.
+"""
+
+import threading
+import time
+import traceback
+
+import psutil
+
+
+class MemoryAccountant:
+    def __init__(self, budget_ms=50, top_n=20, interval_s=2.0, retry_denied_s=300.0):
+        self.budget_ms = budget_ms
+        self.top_n = top_n
+        self.interval_s = interval_s
+        self.retry_denied_s = retry_denied_s
+        self.cache = {}        # pid -> (uss, pss, measured at monotonic); uss None if denied
+        self._targets = []     # pids ordered by RSS, largest first
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_cycle = {'measured': 0, 'elapsed_ms': 0.0}
+
+    def submit(self, procs):
+        """Hand over the latest process snapshot (process_iter() info dicts with memory_info)."""
+        ranked = sorted(((info['pid'], info['memory_info'].rss if info.get('memory_info') else 0) for info in procs),
+                        key=lambda item: item[1], reverse=True)
+        with self._lock:
+            self._targets = [pid for pid, _rss in ranked]
+
+    def get(self, pid):
+        """Return (uss, pss, age in seconds) for pid, or None if not measured yet."""
+        entry = self.cache.get(pid)
+        if entry is None:
+            return None
+        uss, pss, measured_at = entry
+        return uss, pss, time.monotonic() - measured_at
+
+    def _measure(self, pid):
+        try:
+            info = psutil.Process(pid).memory_full_info()
+            self.cache[pid] = (info.uss, getattr(info, 'pss', None), time.monotonic())
+        except psutil.AccessDenied:
+            self.cache[pid] = (None, None, time.monotonic())
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            self.cache.pop(pid, None)
+
+    def run_cycle(self):
+        """Measure as many processes as fit in budget_ms; returns how many were measured."""
+        with self._lock:
+            targets = list(self._targets)
+        started = time.perf_counter()
+        deadline = started + self.budget_ms / 1000.0
+        now = time.monotonic()
+
+        def due(pid):
+            entry = self.cache.get(pid)
+            # don't keep spending budget on processes we are not allowed to read
+            return entry is None or entry[0] is not None or now - entry[2] >= self.retry_denied_s
+
+        top = targets[:self.top_n]
+        rest = sorted(targets[self.top_n:], key=lambda pid: self.cache[pid][2] if pid in self.cache else float('-inf'))
+        measured = 0
+        for pid in top + rest:
+            if time.perf_counter() >= deadline:
+                break
+            if due(pid):
+                self._measure(pid)
+                measured += 1
+
+        alive = set(targets)
+        for pid in [pid for pid in self.cache if pid not in alive]:
+            self.cache.pop(pid, None)
+        self.last_cycle = {'measured': measured, 'elapsed_ms': (time.perf_counter() - started) * 1000}
+        return measured
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.run_cycle()
+            except Exception:
+                traceback.print_exc()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='memory-accounting', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
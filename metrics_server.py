@@ -0,0 +1,209 @@
+"""
+Local Prometheus-style metrics endpoint.
+
+The monitor publishes one snapshot per collection cycle; it is rendered to the
+Prometheus text exposition format once and the cached bytes are served to
+every scrape of /metrics, so any number of scrapers never cause extra psutil
+calls.
+
+    server = MetricsServer(port=9105)
+    server.start()
+    server.publish(collect_snapshot())   # once per refresh
+    # curl http://127.0.0.1:9105/metrics
+
+Binds to 127.0.0.1 by default; pass port=0 to get a free port (see .port).
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psutil
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _as_dict(value):
+    if value is None:
+        return {}
+    if hasattr(value, '_asdict'):
+        return value._asdict()
+    return dict(value)
+
+
+def collect_snapshot(top_n=10, cpu=None, memory=None, disk=None, processes=None, disk_path='/', per_cpu=None):
+    """Gather one cycle of metrics.
+
+    Values the caller already collected this cycle (cpu percent, per-core
+    percents, memory / disk usage as psutil results or dicts, process info
+    dicts) are reused instead of being read again. Pass per_cpu whenever the
+    caller also reads psutil.cpu_percent(percpu=True): psutil keeps a single
+    per-CPU baseline, so a second call would measure a near-zero interval.
+    """
+    if processes is None:
+        processes = []
+        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
+            try:
+                processes.append(proc.info)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+    top = sorted(processes, key=lambda p: (p.get('cpu_percent') or 0.0, p.get('memory_percent') or 0.0),
+                 reverse=True)[:top_n]
+    try:
+        disk_io = psutil.disk_io_counters(perdisk=True) or {}
+    except Exception:
+        disk_io = {}
+    return {
+        'timestamp': time.time(),
+        'cpu': psutil.cpu_percent() if cpu is None else cpu,
+        'per_cpu': psutil.cpu_percent(percpu=True) if per_cpu is None else per_cpu,
+        'memory': _as_dict(memory if memory is not None else psutil.virtual_memory()),
+        'disk_path': disk_path,
+        'disk': _as_dict(disk if disk is not None else psutil.disk_usage(disk_path)),
+        'network': {nic: _as_dict(c) for nic, c in psutil.net_io_counters(pernic=True).items()},
+        'disk_io': {name: _as_dict(c) for name, c in disk_io.items()},
+        'processes': top,
+    }
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+
+class _Family:
+    def __init__(self, name, kind, help_text):
+        self.lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+        self.name = name
+
+    def add(self, value, **labels):
+        if value is None:
+            return
+        text = str(value) if isinstance(value, int) else repr(float(value))
+        self.lines.append(f'{self.name}{_labels(labels)} {text}')
+
+
+def render_metrics(snapshot, prefix='sysmon'):
+    """Render a collect_snapshot() dict in the Prometheus text format."""
+    families = []
+
+    def family(name, kind, help_text):
+        fam = _Family(f'{prefix}_{name}', kind, help_text)
+        families.append(fam)
+        return fam
+
+    family('collection_timestamp_seconds', 'gauge', 'Unix time the snapshot was collected.').add(snapshot.get('timestamp'))
+    family('cpu_percent', 'gauge', 'Total CPU utilisation in percent.').add(snapshot.get('cpu'))
+
+    core = family('cpu_core_percent', 'gauge', 'Per-core CPU utilisation in percent.')
+    for i, value in enumerate(snapshot.get('per_cpu') or []):
+        core.add(value, core=i)
+
+    memory = snapshot.get('memory') or {}
+    mem_bytes = family('memory_bytes', 'gauge', 'Virtual memory in bytes.')
+    for kind in ('total', 'available', 'used', 'free'):
+        mem_bytes.add(memory.get(kind), kind=kind)
+    family('memory_percent', 'gauge', 'Virtual memory used in percent.').add(memory.get('percent'))
+
+    disk = snapshot.get('disk') or {}
+    mountpoint = snapshot.get('disk_path', '/')
+    disk_bytes = family('disk_bytes', 'gauge', 'Disk space in bytes.')
+    for kind in ('total', 'used', 'free'):
+        disk_bytes.add(disk.get(kind), mountpoint=mountpoint, kind=kind)
+    family('disk_percent', 'gauge', 'Disk space used in percent.').add(disk.get('percent'), mountpoint=mountpoint)
+
+    net_bytes = family('network_bytes_total', 'counter', 'Bytes sent / received per interface.')
+    net_packets = family('network_packets_total', 'counter', 'Packets sent / received per interface.')
+    net_errors = family('network_errors_total', 'counter', 'Receive / transmit errors per interface.')
+    for nic, c in sorted((snapshot.get('network') or {}).items()):
+        net_bytes.add(c.get('bytes_sent'), interface=nic, direction='sent')
+        net_bytes.add(c.get('bytes_recv'), interface=nic, direction='recv')
+        net_packets.add(c.get('packets_sent'), interface=nic, direction='sent')
+        net_packets.add(c.get('packets_recv'), interface=nic, direction='recv')
+        net_errors.add(c.get('errout'), interface=nic, direction='sent')
+        net_errors.add(c.get('errin'), interface=nic, direction='recv')
+
+    io_bytes = family('disk_io_bytes_total', 'counter', 'Bytes read / written per disk.')
+    io_ops = family('disk_io_operations_total', 'counter', 'Read / write operations per disk.')
+    for name, c in sorted((snapshot.get('disk_io') or {}).items()):
+        io_bytes.add(c.get('read_bytes'), disk=name, direction='read')
+        io_bytes.add(c.get('write_bytes'), disk=name, direction='write')
+        io_ops.add(c.get('read_count'), disk=name, direction='read')
+        io_ops.add(c.get('write_count'), disk=name, direction='write')
+
+    proc_cpu = family('process_cpu_percent', 'gauge', 'CPU utilisation of the top processes in percent.')
+    proc_mem = family('process_memory_percent', 'gauge', 'Memory utilisation of the top processes in percent.')
+    for p in snapshot.get('processes') or []:
+        labels = {'pid': p.get('pid'), 'name': p.get('name') or ''}
+        proc_cpu.add(p.get('cpu_percent'), **labels)
+        proc_mem.add(p.get('memory_percent'), **labels)
+
+    return '\n'.join(line for fam in families for line in fam.lines) + '\n'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path != '/metrics':
+            self.send_error(404, 'Try /metrics')
+            return
+        body = self.server.metrics.payload()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # keep scrapes out of the console
+        pass
+
+
+class MetricsServer:
+    """Serve the most recently published snapshot at http://host:port/metrics."""
+
+    def __init__(self, host='127.0.0.1', port=9105, prefix='sysmon'):
+        self.host = host
+        self.requested_port = port
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._payload = f'# no {prefix} snapshot collected yet\n'.encode()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1] if self._httpd else self.requested_port
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}/metrics'
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer((self.host, self.requested_port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.metrics = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def publish(self, snapshot):
+        """Render a snapshot once; every later scrape gets these bytes."""
+        payload = render_metrics(snapshot, self.prefix).encode('utf-8')
+        with self._lock:
+            self._payload = payload
+
+    def payload(self):
+        with self._lock:
+            return self._payload
@@ -1,5 +1,9 @@
 import psutil
 import datetime
+import argparse
+import time
+
+from metrics_server import MetricsServer, collect_snapshot
 
 class SystemMonitor:
     def get_cpu_usage(self, interval=0.1):
@@ -53,8 +57,31 @@ def human(n):
         n /= 1024
     return f"{n:.1f}PB"
 
+# Headless mode: keep collecting and serve the metrics for scraping
+def serve_metrics(port, host="127.0.0.1", interval=5.0, top_n=10):
+    server = MetricsServer(host, port).start()
+    print(f"Serving metrics on {server.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            server.publish(collect_snapshot(top_n))
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
 # Pretty print the snapshot
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="System diagnostics snapshot")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="serve Prometheus metrics on PORT instead of printing a snapshot")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind the metrics endpoint to")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between collections when serving")
+    parser.add_argument("--top", type=int, default=10, help="number of top processes to export when serving")
+    args = parser.parse_args()
+    if args.serve is not None:
+        serve_metrics(args.serve, args.host, args.interval, args.top)
+        raise SystemExit(0)
+
     monitor = SystemMonitor()
     snap = monitor.snapshot(top_n=5)
 
@@ -3,10 +3,13 @@ from tkinter import ttk, messagebox
 import psutil, GPUtil, datetime, csv
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import argparse
+from metrics_server import MetricsServer, collect_snapshot
 
 class ProfessionalSystemMonitor:
-    def __init__(self, root):
+    def __init__(self, root, metrics_server=None):
         self.root = root
+        self.metrics_server = metrics_server
         self.root.title("System Diagnostics & Monitoring Tool - Professional")
         self.root.geometry("1000x650")
         self.running = True
@@ -146,9 +149,15 @@ class ProfessionalSystemMonitor:
         # Update process table
         for i in self.tree.get_children():
             self.tree.delete(i)
+        procs = []
         for proc in psutil.process_iter(['pid','name','cpu_percent','memory_percent']):
+            procs.append(proc.info)
             self.tree.insert('',tk.END,values=(proc.info['pid'],proc.info['name'],proc.info['cpu_percent'],round(proc.info['memory_percent'],2)))
 
+        # Metrics endpoint (rendered once per refresh, served from cache)
+        if self.metrics_server is not None:
+            self.metrics_server.publish(collect_snapshot(cpu=cpu, processes=procs))
+
         self.root.after(1000,self.update_stats)
 
     def toggle_logging(self):
@@ -173,6 +182,18 @@ class ProfessionalSystemMonitor:
         self.root.destroy()
 
 if __name__=="__main__":
+    parser = argparse.ArgumentParser(description="System Diagnostics & Monitoring Tool")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    parser.add_argument("--metrics-host", default="127.0.0.1", help="address to bind the metrics endpoint to")
+    args = parser.parse_args()
+
+    server = None
+    if args.metrics_port is not None:
+        server = MetricsServer(args.metrics_host, args.metrics_port).start()
+        print(f"Serving metrics on {server.url}")
+
     root = tk.Tk()
-    app = ProfessionalSystemMonitor(root)
+    app = ProfessionalSystemMonitor(root, metrics_server=server)
     root.mainloop()
+    if server is not None:
+        server.stop()
@@ -0,0 +1,103 @@
+"""
+Bulk process termination helpers.
+
+Signals are sent to every target up front and psutil.wait_procs() then waits
+on all of them together, so killing N processes costs one grace period rather
+than N. Anything still alive after the grace period is escalated to SIGKILL.
+
+Run in a worker thread with terminate_in_background() so the GUI keeps
+refreshing while processes shut down.
+"""
+
+import os
+import threading
+import psutil
+
+
+def collect_targets(pids, include_children=False):
+    """Resolve PIDs to psutil.Process objects, optionally with their descendants.
+
+    Returns (procs, results) where results already holds a status for PIDs
+    that could not be resolved. Children are listed before their parents so a
+    tree is taken down from the leaves up.
+    """
+    procs = {}
+    results = {}
+    own_pid = os.getpid()
+    for pid in pids:
+        if pid == own_pid:
+            results[pid] = 'skipped (this monitor)'
+            continue
+        try:
+            proc = psutil.Process(pid)
+            if include_children:
+                for child in reversed(proc.children(recursive=True)):
+                    if child.pid != own_pid:
+                        procs.setdefault(child.pid, child)
+            procs.setdefault(pid, proc)
+        except psutil.NoSuchProcess:
+            results[pid] = 'already gone'
+        except psutil.AccessDenied:
+            results[pid] = 'access denied'
+    return list(procs.values()), results
+
+
+def _send(procs, method, results):
+    """Call proc.terminate()/proc.kill() on each process; return those signalled."""
+    sent = []
+    for proc in procs:
+        try:
+            getattr(proc, method)()
+            sent.append(proc)
+        except psutil.NoSuchProcess:
+            results[proc.pid] = 'already gone'
+        except psutil.AccessDenied:
+            results[proc.pid] = 'access denied'
+    return sent
+
+
+def terminate_processes(pids, include_children=False, grace_period=3.0, kill_timeout=2.0):
+    """Terminate the given PIDs (and optionally their process trees).
+
+    SIGTERM is sent to all targets at once, then everything is waited on
+    concurrently for grace_period seconds. Survivors get SIGKILL and a further
+    kill_timeout seconds to exit.
+
+    Returns a dict of pid -> status string ('terminated', 'killed',
+    'already gone', 'access denied', 'still running', ...).
+    """
+    procs, results = collect_targets(pids, include_children)
+
+    signalled = _send(procs, 'terminate', results)
+    gone, alive = psutil.wait_procs(signalled, timeout=max(0.0, grace_period))
+    for proc in gone:
+        results[proc.pid] = 'terminated'
+
+    if alive:
+        killed = _send(alive, 'kill', results)
+        gone, alive = psutil.wait_procs(killed, timeout=max(0.0, kill_timeout))
+        for proc in gone:
+            results[proc.pid] = 'killed'
+        for proc in alive:
+            results[proc.pid] = 'still running'
+
+    return results
+
+
+def terminate_in_background(pids, on_done, include_children=False, grace_period=3.0, kill_timeout=2.0):
+    """Run terminate_processes() in a daemon thread.
+
+    on_done(results) is called from the worker thread; GUI callers should hand
+    the results back to the Tk thread (e.g. through a queue) before touching
+    any widgets.
+    """
+    def worker():
+        try:
+            results = terminate_processes(pids, include_children, grace_period, kill_timeout)
+        except Exception as e:
+            results = {pid: f'error: {e}' for pid in pids}
+        on_done(results)
+
+    thread = threading.Thread(target=worker, name='terminate-processes', daemon=True)
+    thread.start()
+    return thread
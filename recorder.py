@@ -0,0 +1,229 @@
+"""
+Delta-compressed snapshot recording and random-access replay.
+
+A recording keeps every tick's system metrics and full process table. Every
+keyframe_interval ticks a keyframe (the whole state) starts a new segment;
+the ticks in between are stored as deltas against the previous tick: new
+PIDs with their rows, exited PIDs, and only the fields that changed. Each
+segment is zlib-compressed as one block, so repeated names and field keys
+compress well.
+
+File layout:
+
+    MAGIC
+    segment*   = header (payload length, first timestamp, tick count)
+                 + zlib(JSON lines: keyframe, delta, delta, ...)
+
+Recording.open() scans only the segment headers to build the keyframe index,
+so seeking to any tick decompresses a single segment.
+"""
+
+import bisect
+import json
+import os
+import struct
+import time
+import zlib
+
+MAGIC = b'SMREC1\n'
+SEGMENT_HEADER = struct.Struct('<IdI')  # payload bytes, first timestamp, ticks
+
+# process_iter() attributes a recording needs, and the fields kept per process
+PROCESS_ATTRS = ['pid', 'name', 'username', 'status', 'cpu_percent', 'memory_percent', 'memory_info', 'num_threads']
+PROCESS_FIELDS = ('name', 'user', 'status', 'cpu', 'mem', 'rss', 'threads')
+
+
+def process_row(info):
+    """Reduce a process_iter() info dict to the recorded fields.
+
+    Values are rounded so that noise below display precision does not show
+    up as a change in every delta.
+    """
+    mem_info = info.get('memory_info')
+    return {
+        'name': info.get('name') or '',
+        'user': info.get('username') or '',
+        'status': info.get('status') or '',
+        'cpu': round(info.get('cpu_percent') or 0.0, 1),
+        'mem': round(info.get('memory_percent') or 0.0, 2),
+        'rss': (mem_info.rss >> 10) if mem_info else 0,  # KB
+        'threads': info.get('num_threads') or 0,
+    }
+
+
+def _changed(old, new):
+    return {k: v for k, v in new.items() if old.get(k) != v}
+
+
+class SnapshotRecorder:
+    """Append per-tick snapshots to a recording file."""
+
+    def __init__(self, path, keyframe_interval=60, level=6):
+        self.path = path
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.level = level
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+        self.ticks = 0
+        self._segment = []
+        self._segment_start = None
+        self._sys = None
+        self._procs = None
+
+    def record(self, system, processes, timestamp=None):
+        """Record one tick.
+
+        system is a flat dict of system metrics; processes an iterable of
+        process_iter() info dicts (see PROCESS_ATTRS).
+        """
+        ts = time.time() if timestamp is None else timestamp
+        procs = {str(info['pid']): process_row(info) for info in processes}
+        system = dict(system)
+
+        if len(self._segment) >= self.keyframe_interval:
+            self._flush()
+        if not self._segment:
+            self._segment_start = ts
+            entry = {'k': 1, 't': ts, 'sys': system, 'procs': procs}
+        else:
+            entry = {'t': ts}
+            sys_changes = _changed(self._sys, system)
+            if sys_changes:
+                entry['sys'] = sys_changes
+            new, changed = {}, {}
+            for pid, row in procs.items():
+                old = self._procs.get(pid)
+                if old is None:
+                    new[pid] = row
+                else:
+                    diff = _changed(old, row)
+                    if diff:
+                        changed[pid] = diff
+            gone = [pid for pid in self._procs if pid not in procs]
+            if new:
+                entry['new'] = new
+            if gone:
+                entry['gone'] = gone
+            if changed:
+                entry['chg'] = changed
+
+        self._segment.append(json.dumps(entry, separators=(',', ':')))
+        self._sys, self._procs = system, procs
+        self.ticks += 1
+
+    def _flush(self):
+        if not self._segment:
+            return
+        payload = zlib.compress('\n'.join(self._segment).encode('utf-8'), self.level)
+        self.file.write(SEGMENT_HEADER.pack(len(payload), self._segment_start, len(self._segment)))
+        self.file.write(payload)
+        self.file.flush()
+        self._segment = []
+
+    def close(self):
+        if self.file.closed:
+            return
+        self._flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Recording:
+    """Random-access reader for a file written by SnapshotRecorder."""
+
+    def __init__(self, path):
+        self.path = path
+        self.segments = []  # (offset, length, first timestamp, ticks)
+        self._starts = []   # first tick number of each segment
+        self._times = []    # first timestamp of each segment
+        self._cache = None  # (segment number, position, timestamps, entries, sys, procs)
+        self.file = open(path, 'rb')
+        if self.file.read(len(MAGIC)) != MAGIC:
+            self.file.close()
+            raise ValueError(f'{path} is not a snapshot recording')
+        self._scan()
+
+    def _scan(self):
+        total = 0
+        size = os.fstat(self.file.fileno()).st_size
+        while True:
+            header = self.file.read(SEGMENT_HEADER.size)
+            if len(header) < SEGMENT_HEADER.size:
+                break
+            length, first_ts, ticks = SEGMENT_HEADER.unpack(header)
+            offset = self.file.tell()
+            if offset + length > size:
+                break  # truncated last segment (crashed or still being written)
+            self.file.seek(length, 1)
+            self.segments.append((offset, length, first_ts, ticks))
+            self._starts.append(total)
+            self._times.append(first_ts)
+            total += ticks
+        self.length = total
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def start_time(self):
+        return self.segments[0][2] if self.segments else None
+
+    def close(self):
+        self.file.close()
+
+    def _load_segment(self, seg):
+        offset, length, _first_ts, _ticks = self.segments[seg]
+        self.file.seek(offset)
+        lines = zlib.decompress(self.file.read(length)).decode('utf-8').split('\n')
+        entries = [json.loads(line) for line in lines]
+        keyframe = entries[0]
+        timestamps = [e['t'] for e in entries]
+        self._cache = [seg, 0, timestamps, entries, dict(keyframe['sys']), dict(keyframe['procs'])]
+
+    def frame(self, index):
+        """Return the full state at tick index: {'t', 'sys', 'procs': {pid: row}}."""
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        seg = bisect.bisect_right(self._starts, index) - 1
+        pos = index - self._starts[seg]
+        if self._cache is None or self._cache[0] != seg or self._cache[1] > pos:
+            self._load_segment(seg)
+        cache = self._cache
+        sys_state, procs = cache[4], cache[5]
+        # roll forward from the cached position; rows are replaced, never mutated,
+        # so frames handed out earlier stay valid
+        for entry in cache[3][cache[1] + 1:pos + 1]:
+            if 'sys' in entry:
+                sys_state = {**sys_state, **entry['sys']}
+            for pid in entry.get('gone', ()):
+                procs.pop(pid, None)
+            procs.update(entry.get('new', {}))
+            for pid, diff in entry.get('chg', {}).items():
+                procs[pid] = {**procs[pid], **diff}
+        cache[1], cache[4] = pos, sys_state
+        return {
+            't': cache[2][pos],
+            'sys': sys_state,
+            'procs': {int(pid): row for pid, row in procs.items()},
+        }
+
+    def index_at(self, timestamp):
+        """Index of the last tick recorded at or before timestamp."""
+        if not self.segments:
+            return 0
+        seg = max(0, bisect.bisect_right(self._times, timestamp) - 1)
+        if self._cache is None or self._cache[0] != seg:
+            self._load_segment(seg)
+        pos = max(0, bisect.bisect_right(self._cache[2], timestamp) - 1)
+        return self._starts[seg] + pos
+
+    def timestamp(self, index):
+        seg = bisect.bisect_right(self._starts, index) - 1
+        if self._cache is None or self._cache[0] != seg:
+            self._load_segment(seg)
+        return self._cache[2][index - self._starts[seg]]
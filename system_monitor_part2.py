@@ -3,28 +3,67 @@ System Diagnostics & Monitoring Tool - Part 2 (Tkinter)
 
 Features included in this file:
  - CPU, RAM, Disk usage with ttk Progressbars and color-coded thresholds
- - Scrollable Treeview showing top processes (PID, Name, Memory%)
+ - Scrollable Treeview showing top processes (PID, Name, container / service,
+   Memory%, and USS / PSS measured in the background within a per-cycle time
+   budget, with their age)
  - Adjustable refresh rate and Pause/Resume auto-refresh
- - Export sampled stats to CSV (logs)
- - Terminate selected process (with confirmation)
+ - Adaptive anomaly detection (EWMA baselines, optionally per core / per
+   network interface) naming the processes that best explain each anomaly
+ - Export sampled stats or on-disk logs to CSV, JSON lines or Excel in the
+   background, with time-range / column selection, progress and cancel
+ - Optional Prometheus metrics endpoint (--metrics-port PORT)
+ - Record full snapshots (system metrics + process table) to a delta-compressed
+   file and replay them with a scrubbable, variable-speed replay window
+ - Per-container / per-service view from cgroup v2 stats (CPU, memory, I/O rates)
+ - Open and chart very large log files: sparse timestamp index, min/max
+   downsampling to screen resolution, pan / zoom re-queries the index
+ - Terminate or kill the process tree of one or more selected processes
+   (with confirmation); runs in the background with SIGTERM -> SIGKILL escalation
 
 Dependencies:
  - psutil (pip install psutil)
+ - openpyxl (optional, for Excel export: pip install openpyxl)
+ - matplotlib (optional, for the log viewer: pip install matplotlib)
 
 Run:
     python system_monitor_part2.py
+    python system_monitor_part2.py --metrics-port 9105   # also serve http://127.0.0.1:9105/metrics
 
 Notes:
  - This file is designed as a polished, ready-to-run Part 2.
  - Some progressbar color changes are platform-dependent; they work well on Windows and many Linux themes.
 """
 
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import psutil
 import datetime
-import csv
+import queue
+import threading
+import time
 import traceback
+import zlib
+
+try:
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+except ImportError:  # optional, only needed for the log viewer
+    Figure = None
+
+import cgroups
+import log_export
+from anomaly import AnomalyDetector, ProcessDeltaTracker
+from log_export import FORMATS, ExportCancelled, export_in_background, parse_timestamp, read_csv_header
+from log_index import LogIndex
+from memory_accounting import MemoryAccountant
+from metrics_server import MetricsServer, collect_snapshot
+from process_actions import terminate_in_background
+from recorder import PROCESS_ATTRS, Recording, SnapshotRecorder
+
+# Process.cpu_num() (last core a process ran on) is not available on Windows / macOS
+HAS_CPU_NUM = hasattr(psutil.Process, 'cpu_num')
 
 
 def bytes_to_human(n):
@@ -40,9 +79,510 @@ def bytes_to_human(n):
     return '0 B'
 
 
+class ExportDialog(tk.Toplevel):
+    """Export collected samples or a log file; the export runs in a worker thread."""
+
+    def __init__(self, app):
+        super().__init__(app.root)
+        self.app = app
+        self.title('Export log')
+        self.resizable(False, False)
+        self.log_path = None
+        self.cancel_event = None
+
+        self.source = tk.StringVar(value='samples')
+        self.fmt = tk.StringVar(value='csv')
+        self.start_var = tk.StringVar()
+        self.end_var = tk.StringVar()
+
+        body = ttk.Frame(self, padding=10)
+        body.pack(fill='both', expand=True)
+
+        ttk.Label(body, text='Source', font=(None, 10, 'bold')).grid(row=0, column=0, sticky='w')
+        ttk.Radiobutton(body, text=f'Collected samples ({len(app.log)})', value='samples',
+                        variable=self.source, command=self._load_columns).grid(row=1, column=0, columnspan=2, sticky='w')
+        ttk.Radiobutton(body, text='Log file:', value='file',
+                        variable=self.source, command=self._load_columns).grid(row=2, column=0, sticky='w')
+        self.file_label = ttk.Label(body, text='(none)', width=40)
+        self.file_label.grid(row=2, column=1, sticky='w')
+        ttk.Button(body, text='Browse...', command=self._choose_file).grid(row=2, column=2, sticky='w')
+
+        ttk.Label(body, text='Columns', font=(None, 10, 'bold')).grid(row=3, column=0, sticky='w', pady=(8, 0))
+        self.columns_list = tk.Listbox(body, selectmode='extended', height=7, exportselection=False)
+        self.columns_list.grid(row=4, column=0, columnspan=3, sticky='we')
+
+        ttk.Label(body, text='From (YYYY-MM-DD HH:MM:SS, optional):').grid(row=5, column=0, columnspan=2, sticky='w', pady=(8, 0))
+        ttk.Entry(body, textvariable=self.start_var, width=22).grid(row=5, column=2, sticky='w', pady=(8, 0))
+        ttk.Label(body, text='To (optional):').grid(row=6, column=0, columnspan=2, sticky='w')
+        ttk.Entry(body, textvariable=self.end_var, width=22).grid(row=6, column=2, sticky='w')
+
+        ttk.Label(body, text='Format', font=(None, 10, 'bold')).grid(row=7, column=0, sticky='w', pady=(8, 0))
+        fmt_frame = ttk.Frame(body)
+        fmt_frame.grid(row=8, column=0, columnspan=3, sticky='w')
+        for key, (label, _ext) in FORMATS.items():
+            button = ttk.Radiobutton(fmt_frame, text=label, value=key, variable=self.fmt)
+            if key == 'xlsx' and log_export.openpyxl is None:
+                # Excel export needs openpyxl; say so up front instead of failing mid-export
+                button.config(text=f'{label} (needs openpyxl)')
+                button.state(['disabled'])
+            button.pack(side='left', padx=(0, 10))
+
+        self.progress = ttk.Progressbar(body, orient='horizontal', length=360, mode='determinate', maximum=100)
+        self.progress.grid(row=9, column=0, columnspan=3, sticky='we', pady=(10, 2))
+        self.progress_label = ttk.Label(body, text='')
+        self.progress_label.grid(row=10, column=0, columnspan=3, sticky='w')
+
+        buttons = ttk.Frame(body)
+        buttons.grid(row=11, column=0, columnspan=3, sticky='e', pady=(8, 0))
+        self.export_btn = ttk.Button(buttons, text='Export...', command=self._start_export)
+        self.export_btn.pack(side='left', padx=(0, 6))
+        self.cancel_btn = ttk.Button(buttons, text='Close', command=self._cancel_or_close)
+        self.cancel_btn.pack(side='left')
+
+        self.protocol('WM_DELETE_WINDOW', self._cancel_or_close)
+        self._load_columns()
+
+    def _choose_file(self):
+        fn = filedialog.askopenfilename(parent=self, title='Choose log file',
+                                        filetypes=[('CSV files', '*.csv'), ('All files', '*.*')])
+        if not fn:
+            return
+        self.log_path = fn
+        self.file_label.config(text=fn if len(fn) <= 40 else '...' + fn[-37:])
+        self.source.set('file')
+        self._load_columns()
+
+    def _load_columns(self):
+        columns = []
+        if self.source.get() == 'file':
+            if self.log_path:
+                try:
+                    columns = read_csv_header(self.log_path)
+                except Exception as e:
+                    messagebox.showerror('Export error', f'Could not read log file: {e}', parent=self)
+        elif self.app.log:
+            columns = list(self.app.log[0].keys())
+        self.columns_list.delete(0, 'end')
+        for col in columns:
+            self.columns_list.insert('end', col)
+        self.columns_list.selection_set(0, 'end')
+
+    def _parse_range(self):
+        bounds = []
+        for var, label in ((self.start_var, 'From'), (self.end_var, 'To')):
+            text = var.get().strip()
+            if not text:
+                bounds.append(None)
+                continue
+            ts = parse_timestamp(text)
+            if ts is None:
+                raise ValueError(f'{label}: could not parse "{text}"')
+            bounds.append(ts)
+        return bounds
+
+    def _start_export(self):
+        if self.source.get() == 'file':
+            if not self.log_path:
+                messagebox.showinfo('No data', 'Choose a log file to export.', parent=self)
+                return
+            source = self.log_path
+        else:
+            if not self.app.log:
+                messagebox.showinfo('No data', 'There are no logged samples to export yet.', parent=self)
+                return
+            source = list(self.app.log)
+        columns = [self.columns_list.get(i) for i in self.columns_list.curselection()]
+        if not columns:
+            messagebox.showinfo('No columns', 'Select at least one column to export.', parent=self)
+            return
+        try:
+            start, end = self._parse_range()
+        except ValueError as e:
+            messagebox.showerror('Invalid time range', str(e), parent=self)
+            return
+
+        fmt = self.fmt.get()
+        label, ext = FORMATS[fmt]
+        fn = filedialog.asksaveasfilename(parent=self, defaultextension=ext, filetypes=[(label, '*' + ext)],
+                                          title='Save log as...')
+        if not fn:
+            return
+
+        def on_progress(count, fraction):
+            self.app.ui_queue.put(lambda: self._on_progress(count, fraction))
+
+        def on_done(count, error):
+            self.app.ui_queue.put(lambda: self._on_done(fn, count, error))
+
+        _thread, self.cancel_event = export_in_background(source, fn, fmt, columns, start, end,
+                                                          on_progress=on_progress, on_done=on_done)
+        self.export_btn.state(['disabled'])
+        self.cancel_btn.config(text='Cancel')
+        self.progress['value'] = 0
+        self.progress_label.config(text='Exporting...')
+
+    def _on_progress(self, count, fraction):
+        if not self.winfo_exists():
+            return
+        self.progress['value'] = fraction * 100
+        self.progress_label.config(text=f'{count} rows written ({fraction * 100:.0f}% of source read)')
+
+    def _on_done(self, fn, count, error):
+        self.cancel_event = None
+        if not self.winfo_exists():
+            return
+        self.export_btn.state(['!disabled'])
+        self.cancel_btn.config(text='Close')
+        if error is None:
+            self.progress['value'] = 100
+            self.progress_label.config(text=f'{count} rows exported to {fn}')
+        elif isinstance(error, ExportCancelled):
+            self.progress['value'] = 0
+            self.progress_label.config(text='Export cancelled.')
+        else:
+            self.progress_label.config(text='Export failed.')
+            messagebox.showerror('Export error', str(error), parent=self)
+
+    def _cancel_or_close(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.progress_label.config(text='Cancelling...')
+            return
+        self.destroy()
+
+
+class ReplayWindow(tk.Toplevel):
+    """Scrub through a snapshot recording at any speed."""
+
+    SPEEDS = ('0.25', '0.5', '1', '2', '5', '10', '60', '600')
+    TOP_N = 100
+
+    def __init__(self, master, recording):
+        super().__init__(master)
+        self.recording = recording
+        self.title(f'Replay — {recording.path}')
+        self.geometry('860x560')
+        self.playing = False
+        self.play_time = recording.timestamp(0)
+        self.index = -1
+        self._last_wall = None
+
+        self.position = tk.DoubleVar(value=0)
+        self.speed = tk.StringVar(value='1')
+        self.sort_by = tk.StringVar(value='cpu')
+
+        controls = ttk.Frame(self, padding=(10, 6))
+        controls.pack(side='top', fill='x')
+        self.play_btn = ttk.Button(controls, text='Play', command=self.toggle_play, width=8)
+        self.play_btn.pack(side='left')
+        ttk.Label(controls, text='Speed:').pack(side='left', padx=(10, 2))
+        ttk.Combobox(controls, textvariable=self.speed, values=self.SPEEDS, width=5, state='readonly').pack(side='left')
+        ttk.Label(controls, text='Sort by:').pack(side='left', padx=(10, 2))
+        sort_box = ttk.Combobox(controls, textvariable=self.sort_by, values=('cpu', 'mem', 'rss', 'threads'), width=7, state='readonly')
+        sort_box.pack(side='left')
+        sort_box.bind('<<ComboboxSelected>>', lambda e: self.show(self.index, force=True))
+        self.scale = ttk.Scale(controls, from_=0, to=max(0, len(recording) - 1), orient='horizontal',
+                               variable=self.position, command=self._on_scrub)
+        self.scale.pack(side='left', fill='x', expand=True, padx=(10, 0))
+
+        self.info = ttk.Label(self, text='', padding=(10, 2), anchor='w')
+        self.info.pack(side='top', fill='x')
+
+        columns = ('pid', 'name', 'user', 'status', 'cpu', 'mem', 'rss', 'threads')
+        frame = ttk.Frame(self, padding=(10, 6))
+        frame.pack(side='top', fill='both', expand=True)
+        self.tree = ttk.Treeview(frame, columns=columns, show='headings')
+        for col, text, width, anchor in (('pid', 'PID', 70, 'center'), ('name', 'Name', 220, 'w'),
+                                         ('user', 'User', 100, 'w'), ('status', 'Status', 80, 'w'),
+                                         ('cpu', 'CPU %', 70, 'e'), ('mem', 'Memory %', 80, 'e'),
+                                         ('rss', 'RSS', 90, 'e'), ('threads', 'Threads', 70, 'e')):
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width, anchor=anchor)
+        vsb = ttk.Scrollbar(frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vsb.set)
+        vsb.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        self.protocol('WM_DELETE_WINDOW', self._on_close)
+        self.show(0)
+        self.after(100, self._tick)
+
+    def show(self, index, force=False):
+        index = max(0, min(int(index), len(self.recording) - 1))
+        if index == self.index and not force:
+            return
+        try:
+            frame = self.recording.frame(index)
+        except (zlib.error, ValueError, OSError) as e:
+            self.info.config(text=f'Could not read tick {index + 1}: {e}')
+            return
+        self.index = index
+        self.position.set(index)
+        system = frame['sys']
+        when = datetime.datetime.fromtimestamp(frame['t']).isoformat(sep=' ', timespec='seconds')
+        self.info.config(text=f"{when}   tick {index + 1}/{len(self.recording)}   |  "
+                              f"CPU {system.get('cpu', 0):.1f}%  RAM {system.get('mem_pct', 0):.1f}%  "
+                              f"Disk {system.get('disk_pct', 0):.1f}%  |  {len(frame['procs'])} processes")
+        key = self.sort_by.get()
+        rows = sorted(frame['procs'].items(), key=lambda item: item[1].get(key, 0), reverse=True)
+        self.tree.delete(*self.tree.get_children())
+        for pid, row in rows[:self.TOP_N]:
+            self.tree.insert('', 'end', values=(pid, row['name'], row['user'], row['status'], f"{row['cpu']:.1f}",
+                                                f"{row['mem']:.2f}", bytes_to_human(row['rss'] * 1024), row['threads']))
+
+    def _on_scrub(self, value):
+        self.show(float(value))
+        self.play_time = self.recording.timestamp(self.index)
+
+    def toggle_play(self):
+        self.playing = not self.playing
+        self._last_wall = time.monotonic()
+        if self.playing and self.index >= len(self.recording) - 1:
+            self.show(0)
+            self.play_time = self.recording.timestamp(0)
+        self.play_btn.config(text='Pause' if self.playing else 'Play')
+
+    def _tick(self):
+        if not self.winfo_exists():
+            return
+        if self.playing:
+            now = time.monotonic()
+            self.play_time += (now - self._last_wall) * float(self.speed.get())
+            self._last_wall = now
+            self.show(self.recording.index_at(self.play_time))
+            if self.index >= len(self.recording) - 1:
+                self.toggle_play()
+        self.after(100, self._tick)
+
+    def _on_close(self):
+        self.recording.close()
+        self.destroy()
+
+
+class CgroupWindow(tk.Toplevel):
+    """Per-container / per-service resource usage from the cgroup v2 tree."""
+
+    def __init__(self, master, collector, refresh_rate_ms):
+        super().__init__(master)
+        self.collector = collector
+        self.refresh_rate_ms = refresh_rate_ms
+        self.title('Containers & services (cgroup v2)')
+        self.geometry('900x480')
+        self.only_with_pids = tk.BooleanVar(value=True)
+
+        controls = ttk.Frame(self, padding=(10, 6))
+        controls.pack(side='top', fill='x')
+        ttk.Checkbutton(controls, text='Only cgroups with processes', variable=self.only_with_pids,
+                        command=self._render).pack(side='left')
+        self.summary = ttk.Label(controls, text='')
+        self.summary.pack(side='right')
+
+        columns = ('name', 'cpu', 'mem', 'read', 'write', 'pids', 'path')
+        frame = ttk.Frame(self, padding=(10, 6))
+        frame.pack(side='top', fill='both', expand=True)
+        self.tree = ttk.Treeview(frame, columns=columns, show='headings')
+        for col, text, width, anchor in (('name', 'Container / service', 200, 'w'), ('cpu', 'CPU %', 70, 'e'),
+                                         ('mem', 'Memory', 90, 'e'), ('read', 'Read/s', 90, 'e'),
+                                         ('write', 'Write/s', 90, 'e'), ('pids', 'PIDs', 60, 'e'),
+                                         ('path', 'cgroup', 300, 'w')):
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width, anchor=anchor)
+        vsb = ttk.Scrollbar(frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vsb.set)
+        vsb.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.tree.bind('<Double-1>', self._show_processes)
+
+        self._refresh()
+
+    def _refresh(self):
+        if not self.winfo_exists():
+            return
+        try:
+            self.collector.sample()
+            self._render()
+        except Exception as e:
+            self.summary.config(text=f'Update error: {e}')
+            traceback.print_exc()
+        try:
+            ms = max(200, int(self.refresh_rate_ms.get()))
+        except Exception:
+            ms = 2000
+        self.after(ms, self._refresh)
+
+    def _render(self):
+        def fmt_rate(value):
+            return '-' if value is None else f'{bytes_to_human(max(0, value))}'
+
+        rows = [s for s in self.collector.stats.values() if s['pids'] or not self.only_with_pids.get()]
+        rows.sort(key=lambda s: s['cpu_percent'] or 0.0, reverse=True)
+        self.tree.delete(*self.tree.get_children())
+        for s in rows:
+            cpu = '-' if s['cpu_percent'] is None else f"{s['cpu_percent']:.1f}"
+            mem = '-' if s['memory'] is None else bytes_to_human(s['memory'])
+            self.tree.insert('', 'end', iid=s['path'], values=(s['name'], cpu, mem, fmt_rate(s['read_bps']),
+                                                                fmt_rate(s['write_bps']), s['pids'], s['path']))
+        self.summary.config(text=f'{len(self.collector.dirs)} cgroups, {self.collector.rescans} tree scans')
+
+    def _show_processes(self, event):
+        sel = self.tree.selection()
+        if not sel:
+            return
+        path = sel[0]
+        pids = self.collector.pids.get(path.lstrip('/'), [])
+        lines = []
+        for pid in pids[:50]:
+            try:
+                lines.append(f'{pid}: {psutil.Process(pid).name()}')
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                lines.append(f'{pid}: ?')
+        if len(pids) > 50:
+            lines.append(f'... and {len(pids) - 50} more')
+        messagebox.showinfo(f'Processes in {path}', '\n'.join(lines) or 'No processes.', parent=self)
+
+
+class LogViewerWindow(tk.Toplevel):
+    """Chart a (possibly huge) CSV log; every view is re-queried from the index."""
+
+    def __init__(self, master, index, ui_queue):
+        super().__init__(master)
+        self.index = index
+        self.ui_queue = ui_queue
+        self.title(f'Log — {index.path}')
+        self.geometry('1000x680')
+        self.cancel_event = threading.Event()
+        self.column_vars = {}
+        self.axes = {}
+        self.lines = {}
+        self._pending = None
+        self.user_ylim = set()     # columns whose y-range the user zoomed / panned
+        self._autoscaling = False  # set while _requery adjusts y itself
+
+        top = ttk.Frame(self, padding=(10, 6))
+        top.pack(side='top', fill='x')
+        self.columns_frame = ttk.Frame(top)
+        self.columns_frame.pack(side='left')
+        self.info = ttk.Label(top, text='Indexing...')
+        self.info.pack(side='right')
+        self.progress = ttk.Progressbar(self, orient='horizontal', mode='determinate', maximum=100)
+        self.progress.pack(side='top', fill='x', padx=10)
+
+        self.figure = Figure(figsize=(9, 5), dpi=100)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, self, pack_toolbar=False)
+        self.toolbar.pack(side='bottom', fill='x')
+        self.canvas.get_tk_widget().pack(side='top', fill='both', expand=True)
+
+        self.protocol('WM_DELETE_WINDOW', self._on_close)
+        threading.Thread(target=self._build_index, name='log-index', daemon=True).start()
+
+    def _build_index(self):
+        def progress(fraction):
+            self.ui_queue.put(lambda: self._on_progress(fraction))
+        try:
+            self.index.build(progress, self.cancel_event)
+            error = None
+        except Exception as e:
+            error = e
+        if not self.cancel_event.is_set():
+            self.ui_queue.put(lambda: self._on_indexed(error))
+
+    def _on_progress(self, fraction):
+        if self.winfo_exists():
+            self.progress['value'] = fraction * 100
+            self.info.config(text=f'Indexing... {fraction * 100:.0f}%')
+
+    def _on_indexed(self, error):
+        if not self.winfo_exists():
+            return
+        self.progress.pack_forget()
+        if error is not None:
+            self.info.config(text='Could not index log.')
+            messagebox.showerror('Log viewer', str(error), parent=self)
+            return
+        numeric = self.index.numeric_columns
+        if not numeric:
+            self.info.config(text='No numeric columns found.')
+            return
+        for name in numeric:
+            var = tk.BooleanVar(value=name in numeric[:3])
+            ttk.Checkbutton(self.columns_frame, text=name, variable=var, command=self._setup_axes).pack(side='left', padx=(0, 6))
+            self.column_vars[name] = var
+        lo, hi = self.index.time_range
+        self.info.config(text=f'{self.index.rows} rows, {len(self.index.offsets)} index blocks, '
+                              f'{datetime.datetime.fromtimestamp(lo):%Y-%m-%d %H:%M} – {datetime.datetime.fromtimestamp(hi):%Y-%m-%d %H:%M}')
+        self._setup_axes()
+
+    def _setup_axes(self):
+        selected = [name for name, var in self.column_vars.items() if var.get()]
+        xlim = None
+        if self.axes:
+            xlim = next(iter(self.axes.values())).get_xlim()
+        self.figure.clear()
+        self.axes, self.lines = {}, {}
+        self.user_ylim = set()
+        formatter = FuncFormatter(lambda x, pos: datetime.datetime.fromtimestamp(x).strftime('%m-%d %H:%M:%S'))
+        shared = None
+        for n, name in enumerate(selected):
+            ax = self.figure.add_subplot(len(selected), 1, n + 1, sharex=shared)
+            shared = shared or ax
+            ax.set_ylabel(name)
+            ax.xaxis.set_major_formatter(formatter)
+            self.lines[name], = ax.plot([], [], linewidth=0.8)
+            self.axes[name] = ax
+            ax.callbacks.connect('ylim_changed', lambda _ax, name=name: self._on_ylim_changed(name))
+        if shared is not None:
+            lo, hi = self.index.time_range
+            shared.set_xlim(*(xlim or (lo, hi if hi > lo else lo + 1)))
+            shared.callbacks.connect('xlim_changed', self._on_xlim_changed)
+            self.figure.autofmt_xdate()
+        self._requery()
+
+    def _on_xlim_changed(self, ax):
+        # pan / zoom fires this repeatedly; re-query once things settle
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(150, self._requery)
+
+    def _on_ylim_changed(self, name):
+        # a y change we did not make came from the toolbar (zoom rectangle / pan)
+        if not self._autoscaling:
+            self.user_ylim.add(name)
+
+    def _requery(self):
+        self._pending = None
+        if not self.axes:
+            return
+        first = next(iter(self.axes.values()))
+        start, end = first.get_xlim()
+        lo, hi = self.index.time_range
+        if start <= lo and end >= hi:
+            # back to the full range (e.g. the toolbar's Home): autoscale again
+            self.user_ylim.clear()
+        buckets = max(100, int(first.bbox.width))
+        result = self.index.query(list(self.axes), start, end, buckets)
+        self._autoscaling = True
+        try:
+            for name, (xs, ys) in result.items():
+                self.lines[name].set_data(xs, ys)
+                if ys and name not in self.user_ylim:
+                    low, high = min(ys), max(ys)
+                    pad = (high - low) * 0.05 or 1.0
+                    self.axes[name].set_ylim(low - pad, high + pad)
+        finally:
+            self._autoscaling = False
+        self.canvas.draw_idle()
+
+    def _on_close(self):
+        self.cancel_event.set()
+        self.index.close()
+        self.destroy()
+
+
 class SystemMonitorGUI:
-    def __init__(self, root):
+    def __init__(self, root, metrics_server=None):
         self.root = root
+        self.metrics_server = metrics_server  # optional MetricsServer, fed once per refresh
         self.root.title("System Diagnostics & Monitoring Tool — Part 2")
         self.root.geometry("900x640")
 
@@ -52,6 +592,32 @@ class SystemMonitorGUI:
         self.log = []  # list of dicts with timestamp, cpu, mem, disk
         self.alerts_shown = {"cpu": False, "mem": False, "disk": False}
         self.alert_thresholds = {"cpu": 85.0, "mem": 85.0, "disk": 95.0}
+        self.grace_period_s = tk.DoubleVar(value=3.0)  # SIGTERM -> SIGKILL escalation delay
+        # callables posted by worker threads, run on the Tk thread
+        self.ui_queue = queue.Queue()
+        self.export_dialog = None
+
+        # Anomaly detection
+        self.detect_anomalies = tk.BooleanVar(value=True)
+        self.detect_per_series = tk.BooleanVar(value=False)  # per-core CPU and per-interface network
+        self.anomaly_detector = AnomalyDetector()
+        self.proc_deltas = ProcessDeltaTracker()
+        self.anomaly_cost_ms = 0.0  # time spent on detection in the last tick
+        self.anomaly_budget = 0.1   # share of the refresh interval detection may use
+        self._last_net = None  # (monotonic time, pernic counters)
+
+        # Snapshot recording / replay
+        self.recorder = None
+        self.replay_window = None
+        self.cgroup_window = None
+        self.log_viewers = []
+        # PID -> cgroup map for the process table's container column (also feeds the cgroup window)
+        self.cgroup_collector = cgroups.CgroupCollector() if cgroups.available() else None
+
+        # Background USS / PSS accounting for the process table
+        self.uss_enabled = tk.BooleanVar(value=True)
+        self.uss_budget_ms = tk.IntVar(value=50)
+        self.mem_accountant = MemoryAccountant(budget_ms=self.uss_budget_ms.get(), top_n=30).start()
 
         # Styles
         self.style = ttk.Style(self.root)
@@ -67,8 +633,11 @@ class SystemMonitorGUI:
         self._create_processes_frame()
         self._create_statusbar()
 
+        self.root.protocol('WM_DELETE_WINDOW', self._on_close)
+
         # Start updates
         self.root.after(1000, self.update_stats)
+        self.root.after(100, self._drain_ui_queue)
 
     def _create_top_metrics_frame(self):
         frame = ttk.Frame(self.root, padding=(10, 8))
@@ -98,6 +667,10 @@ class SystemMonitorGUI:
         self.disk_value = ttk.Label(frame, text="0%", width=30)
         self.disk_value.grid(row=5, column=1, sticky='w', padx=(8, 0))
 
+        # Latest anomaly and its likely culprits
+        self.anomaly_label = ttk.Label(frame, text="Anomalies: none", foreground='#c0392b')
+        self.anomaly_label.grid(row=6, column=0, columnspan=2, sticky='w')
+
         # Provide a little spacing column expand
         frame.grid_columnconfigure(0, weight=1)
 
@@ -118,20 +691,57 @@ class SystemMonitorGUI:
         refresh_btn = ttk.Button(frame, text="Refresh Now", command=self.update_stats_now)
         refresh_btn.grid(row=0, column=3, sticky='w', padx=(10, 6))
 
-        # Export CSV
-        export_btn = ttk.Button(frame, text="Export log to CSV", command=self.export_csv)
+        # Export log (CSV / JSON lines / Excel)
+        export_btn = ttk.Button(frame, text="Export log...", command=self.open_export_dialog)
         export_btn.grid(row=0, column=4, sticky='w', padx=(6, 6))
 
-        # Terminate process
-        self.terminate_btn = ttk.Button(frame, text="Terminate Selected Process", command=self.terminate_selected_process)
+        # Terminate process(es)
+        self.terminate_btn = ttk.Button(frame, text="Terminate Selected", command=self.terminate_selected_process)
         self.terminate_btn.grid(row=0, column=5, sticky='w', padx=(6, 6))
         self.terminate_btn.state(['disabled'])
 
+        # Kill process tree(s)
+        self.kill_tree_btn = ttk.Button(frame, text="Kill Process Tree", command=self.kill_selected_tree)
+        self.kill_tree_btn.grid(row=0, column=6, sticky='w', padx=(6, 6))
+        self.kill_tree_btn.state(['disabled'])
+
         # Clear logs
         clear_btn = ttk.Button(frame, text="Clear Logs", command=self.clear_logs)
-        clear_btn.grid(row=0, column=6, sticky='w', padx=(6, 6))
+        clear_btn.grid(row=0, column=7, sticky='w', padx=(6, 6))
+
+        # Grace period before SIGTERM is escalated to SIGKILL
+        ttk.Label(frame, text="Kill grace (s):").grid(row=1, column=0, sticky='w', pady=(6, 0))
+        self.grace_spin = ttk.Spinbox(frame, from_=0, to=60, increment=0.5, textvariable=self.grace_period_s, width=8)
+        self.grace_spin.grid(row=1, column=1, sticky='w', padx=(6, 14), pady=(6, 0))
+
+        # Anomaly detection toggles
+        ttk.Checkbutton(frame, text="Detect anomalies", variable=self.detect_anomalies).grid(row=1, column=2, sticky='w', pady=(6, 0))
+        ttk.Checkbutton(frame, text="Per core / per interface", variable=self.detect_per_series).grid(row=1, column=3, columnspan=2, sticky='w', pady=(6, 0))
+
+        # Snapshot recording / replay
+        self.record_btn = ttk.Button(frame, text="Start Recording", command=self.toggle_recording)
+        self.record_btn.grid(row=1, column=5, sticky='w', padx=(6, 6), pady=(6, 0))
+        replay_btn = ttk.Button(frame, text="Replay...", command=self.open_replay)
+        replay_btn.grid(row=1, column=6, sticky='w', padx=(6, 6), pady=(6, 0))
+
+        # Per-container / per-service (cgroup v2) view
+        containers_btn = ttk.Button(frame, text="Containers...", command=self.open_cgroups)
+        containers_btn.grid(row=1, column=7, sticky='w', padx=(6, 6), pady=(6, 0))
+
+        # USS / PSS accounting
+        ttk.Checkbutton(frame, text="USS / PSS", variable=self.uss_enabled).grid(row=2, column=0, sticky='w', pady=(6, 0))
+        ttk.Label(frame, text="Budget (ms/cycle):").grid(row=2, column=1, sticky='w', pady=(6, 0))
+        self.uss_budget_spin = ttk.Spinbox(frame, from_=5, to=1000, increment=5, textvariable=self.uss_budget_ms, width=8)
+        self.uss_budget_spin.grid(row=2, column=2, sticky='w', padx=(6, 14), pady=(6, 0))
+        # what the last accounting cycle managed within the budget
+        self.uss_cycle_label = ttk.Label(frame, text="")
+        self.uss_cycle_label.grid(row=2, column=3, columnspan=4, sticky='w', pady=(6, 0))
 
-        frame.grid_columnconfigure(7, weight=1)
+        # Chart an existing log file
+        open_log_btn = ttk.Button(frame, text="Open log...", command=self.open_log_viewer)
+        open_log_btn.grid(row=0, column=8, sticky='w', padx=(6, 6))
+
+        frame.grid_columnconfigure(9, weight=1)
 
     def _create_processes_frame(self):
         frame = ttk.Frame(self.root, padding=(10, 6))
@@ -140,14 +750,22 @@ class SystemMonitorGUI:
         title = ttk.Label(frame, text="Running Processes (top by memory %)", font=(None, 11, 'bold'))
         title.pack(side='top', anchor='w')
 
-        columns = ('pid', 'name', 'mem')
-        self.tree = ttk.Treeview(frame, columns=columns, show='headings', selectmode='browse')
+        columns = ('pid', 'name', 'container', 'mem', 'uss', 'pss', 'age')
+        self.tree = ttk.Treeview(frame, columns=columns, show='headings', selectmode='extended')
         self.tree.heading('pid', text='PID')
         self.tree.heading('name', text='Name')
+        self.tree.heading('container', text='Container / service')
         self.tree.heading('mem', text='Memory %')
+        self.tree.heading('uss', text='USS')
+        self.tree.heading('pss', text='PSS')
+        self.tree.heading('age', text='Measured')
         self.tree.column('pid', width=70, anchor='center')
-        self.tree.column('name', width=520, anchor='w')
-        self.tree.column('mem', width=100, anchor='e')
+        self.tree.column('name', width=240, anchor='w')
+        self.tree.column('container', width=160, anchor='w')
+        self.tree.column('mem', width=90, anchor='e')
+        self.tree.column('uss', width=90, anchor='e')
+        self.tree.column('pss', width=90, anchor='e')
+        self.tree.column('age', width=80, anchor='e')
 
         vsb = ttk.Scrollbar(frame, orient='vertical', command=self.tree.yview)
         self.tree.configure(yscrollcommand=vsb.set)
@@ -188,6 +806,10 @@ class SystemMonitorGUI:
         try:
             # --- System-wide metrics ---
             cpu = psutil.cpu_percent(interval=0.12)
+            # per-core usage since the previous tick; read once, psutil keeps a single baseline
+            per_cpu = None
+            if self.metrics_server is not None or (self.detect_anomalies.get() and self.detect_per_series.get()):
+                per_cpu = psutil.cpu_percent(percpu=True)
             self.cpu_progress['value'] = cpu
             self.cpu_value.config(text=f"{cpu:.1f}%")
             self._set_progress_color('CPU.Horizontal.TProgressbar', cpu)
@@ -207,8 +829,13 @@ class SystemMonitorGUI:
             self._set_progress_color('Disk.Horizontal.TProgressbar', disk_pct)
 
             # --- Processes (top by memory%) ---
+            attrs = ['pid', 'name', 'create_time', 'memory_percent', 'cpu_percent', 'cpu_times', 'memory_info']
+            if HAS_CPU_NUM:
+                attrs.append('cpu_num')
+            if self.recorder is not None:
+                attrs = sorted(set(attrs) | set(PROCESS_ATTRS))
             procs = []
-            for p in psutil.process_iter(['pid', 'name', 'memory_percent']):
+            for p in psutil.process_iter(attrs):
                 try:
                     info = p.info
                     # normalize name
@@ -222,13 +849,39 @@ class SystemMonitorGUI:
 
             # keep top N
             top_n = 30
+            if self.uss_enabled.get():
+                try:
+                    self.mem_accountant.budget_ms = max(1, int(self.uss_budget_ms.get()))
+                except Exception:
+                    pass
+                self.mem_accountant.submit(procs)
+                self.mem_accountant.start()
+                cycle = self.mem_accountant.last_cycle
+                self.uss_cycle_label.config(text=f"Last cycle: {cycle['measured']} measured in {cycle['elapsed_ms']:.0f} ms"
+                                                 f"  |  {len(self.mem_accountant.cache)}/{len(procs)} processes cached")
+            else:
+                self.mem_accountant.stop()
+                self.uss_cycle_label.config(text="")
+            if self.cgroup_collector is not None:
+                self.cgroup_collector.update_pids()
             # update tree view
             self.tree.delete(*self.tree.get_children())
             for proc in procs[:top_n]:
                 pid = proc.get('pid')
                 name = proc.get('name') or ''
                 mem_p = proc.get('memory_percent') or 0.0
-                self.tree.insert('', 'end', values=(pid, name, f"{mem_p:.1f}"))
+                self.tree.insert('', 'end', values=(pid, name, self._container_of(pid), f"{mem_p:.1f}")
+                                 + self._uss_columns(pid))
+
+            # --- Metrics endpoint (rendered once per refresh, served from cache) ---
+            if self.metrics_server is not None:
+                self.metrics_server.publish(collect_snapshot(cpu=cpu, memory=mem, disk=disk, processes=procs,
+                                                              per_cpu=per_cpu))
+
+            # --- Snapshot recording ---
+            if self.recorder is not None:
+                self.recorder.record({'cpu': cpu, 'mem_pct': mem_pct, 'mem_used': mem.used,
+                                      'disk_pct': disk_pct, 'disk_used': disk.used}, procs)
 
             # --- Logging ---
             ts = datetime.datetime.now().isoformat(timespec='seconds')
@@ -239,9 +892,16 @@ class SystemMonitorGUI:
 
             # --- Alerts ---
             self._check_alerts(cpu, mem_pct, disk_pct)
+            if self.detect_anomalies.get():
+                self._detect_anomalies(cpu, mem_pct, disk_pct, procs, per_cpu)
 
             # --- Statusbar ---
-            self.status.config(text=f'Last updated: {ts}   |  Samples logged: {len(self.log)}')
+            status = f'Last updated: {ts}   |  Samples logged: {len(self.log)}'
+            if self.recorder is not None:
+                status += f'   |  Recording: {self.recorder.ticks} ticks'
+            if self.detect_anomalies.get():
+                status += f'   |  Anomaly check: {self.anomaly_cost_ms:.1f} ms'
+            self.status.config(text=status)
 
         except Exception as e:
             # show in statusbar and print stack for debugging
@@ -280,34 +940,170 @@ class SystemMonitorGUI:
         if disk < (self.alert_thresholds['disk'] - 5):
             self.alerts_shown['disk'] = False
 
-    def export_csv(self):
-        if not self.log:
-            messagebox.showinfo('No data', 'There are no logged samples to export yet.')
+    def _uss_columns(self, pid):
+        acct = self.mem_accountant.get(pid) if self.uss_enabled.get() else None
+        if acct is None:
+            return ('-', '-', '-')
+        uss, pss, age = acct
+        if uss is None:
+            return ('denied', 'denied', f'{age:.0f}s ago')
+        pss_text = bytes_to_human(pss) if pss is not None else '-'
+        return (bytes_to_human(uss), pss_text, f'{age:.0f}s ago')
+
+    def _container_of(self, pid):
+        rel = self.cgroup_collector.cgroup_of(pid) if self.cgroup_collector is not None else None
+        return '-' if rel is None else cgroups.friendly_name(rel)
+
+    def _series_sample(self, cpu, mem, disk, per_cpu):
+        sample = {'cpu': cpu, 'mem': mem, 'disk': disk}
+        if not self.detect_per_series.get():
+            self._last_net = None
+            return sample
+        for i, core in enumerate(per_cpu or []):
+            sample[f'cpu_core_{i}'] = core
+        now = time.monotonic()
+        pernic = psutil.net_io_counters(pernic=True)
+        if self._last_net is not None:
+            last_time, last_pernic = self._last_net
+            elapsed = max(now - last_time, 1e-6)
+            for nic, counters in pernic.items():
+                prev = last_pernic.get(nic)
+                if prev is None:
+                    continue
+                sample[f'net_{nic}_up_kbps'] = (counters.bytes_sent - prev.bytes_sent) / 1024 / elapsed
+                sample[f'net_{nic}_down_kbps'] = (counters.bytes_recv - prev.bytes_recv) / 1024 / elapsed
+        self._last_net = (now, pernic)
+        return sample
+
+    def _detect_anomalies(self, cpu, mem, disk, procs, per_cpu=None):
+        started = time.perf_counter()
+        self.proc_deltas.update(procs)
+        found = self.anomaly_detector.update(self._series_sample(cpu, mem, disk, per_cpu))
+        self.anomaly_cost_ms = (time.perf_counter() - started) * 1000
+        # keep detection inside the tick budget: per-series detection is the part that scales
+        try:
+            budget_ms = max(200, int(self.refresh_rate_ms.get())) * self.anomaly_budget
+        except Exception:
+            budget_ms = 200
+        if self.detect_per_series.get() and self.anomaly_cost_ms > budget_ms:
+            self.detect_per_series.set(False)
+            self.anomaly_label.config(text=f'Per-core / per-interface detection turned off: '
+                                           f'{self.anomaly_cost_ms:.1f} ms exceeds the {budget_ms:.0f} ms budget')
+        if not found:
+            return
+        ts = datetime.datetime.now().strftime('%H:%M:%S')
+        parts = []
+        for anomaly in found:
+            metric = anomaly['metric']
+            culprits = self.proc_deltas.culprits(metric)
+            text = f"{metric} {anomaly['value']:.1f} (baseline {anomaly['mean']:.1f}, z={anomaly['z']:.1f})"
+            if culprits:
+                if metric.startswith('mem'):
+                    who = ', '.join(f'{name} [{pid}] +{bytes_to_human(d)}' for pid, name, d, _share in culprits)
+                else:
+                    who = ', '.join(f'{name} [{pid}] {d:.0f}%' for pid, name, d, _share in culprits)
+                text += f' <- {who}'
+            parts.append(text)
+        self.anomaly_label.config(text=f'Anomalies @ {ts}: ' + ';  '.join(parts))
+
+    def toggle_recording(self):
+        if self.recorder is None:
+            fn = filedialog.asksaveasfilename(defaultextension='.smrec', filetypes=[('Snapshot recordings', '*.smrec')],
+                                              title='Record snapshots to...')
+            if not fn:
+                return
+            try:
+                self.recorder = SnapshotRecorder(fn)
+            except Exception as e:
+                messagebox.showerror('Recording error', str(e))
+                return
+            self.record_btn.config(text='Stop Recording')
+        else:
+            self.recorder.close()
+            self.recorder = None
+            self.record_btn.config(text='Start Recording')
+
+    def open_replay(self):
+        if self.replay_window is not None and self.replay_window.winfo_exists():
+            self.replay_window.lift()
             return
-        fn = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[('CSV files', '*.csv')], title='Save log as...')
+        fn = filedialog.askopenfilename(filetypes=[('Snapshot recordings', '*.smrec'), ('All files', '*.*')],
+                                        title='Open recording')
         if not fn:
             return
         try:
-            with open(fn, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['timestamp', 'cpu', 'mem_pct', 'disk_pct'])
-                writer.writeheader()
-                for row in self.log:
-                    writer.writerow(row)
-            messagebox.showinfo('Export complete', f'Log exported to: {fn}')
+            recording = Recording(fn)
         except Exception as e:
-            messagebox.showerror('Export error', str(e))
+            messagebox.showerror('Replay error', f'Could not open recording: {e}')
+            return
+        if not len(recording):
+            recording.close()
+            messagebox.showinfo('Empty recording', 'This recording has no complete snapshots yet.')
+            return
+        self.replay_window = ReplayWindow(self.root, recording)
+
+    def open_cgroups(self):
+        if self.cgroup_window is not None and self.cgroup_window.winfo_exists():
+            self.cgroup_window.lift()
+            return
+        if not cgroups.available():
+            messagebox.showinfo('Containers', 'No cgroup v2 hierarchy found (Linux with a unified cgroup mount is required).')
+            return
+        if self.cgroup_collector is None:
+            self.cgroup_collector = cgroups.CgroupCollector()
+        self.cgroup_window = CgroupWindow(self.root, self.cgroup_collector, self.refresh_rate_ms)
+
+    def open_log_viewer(self):
+        if Figure is None:
+            messagebox.showerror('Log viewer', 'The log viewer needs matplotlib (pip install matplotlib).')
+            return
+        fn = filedialog.askopenfilename(filetypes=[('CSV logs', '*.csv'), ('All files', '*.*')], title='Open log')
+        if not fn:
+            return
+        try:
+            index = LogIndex(fn)
+        except Exception as e:
+            messagebox.showerror('Log viewer', f'Could not open log: {e}')
+            return
+        self.log_viewers = [w for w in self.log_viewers if w.winfo_exists()]
+        self.log_viewers.append(LogViewerWindow(self.root, index, self.ui_queue))
+
+    def _on_close(self):
+        self.mem_accountant.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        self.root.destroy()
+
+    def open_export_dialog(self):
+        if self.export_dialog is not None and self.export_dialog.winfo_exists():
+            self.export_dialog.lift()
+            return
+        self.export_dialog = ExportDialog(self)
 
     def clear_logs(self):
         if messagebox.askyesno('Clear logs', 'Are you sure you want to clear the collected samples?'):
             self.log = []
             self.status.config(text='Last updated: -   |  Samples logged: 0')
 
+    def _drain_ui_queue(self):
+        # run callbacks handed over by worker threads
+        try:
+            while True:
+                callback = self.ui_queue.get_nowait()
+                try:
+                    callback()
+                except Exception:
+                    traceback.print_exc()
+        except queue.Empty:
+            pass
+        self.root.after(100, self._drain_ui_queue)
+
     def _on_process_select(self, event):
         sel = self.tree.selection()
-        if sel:
-            self.terminate_btn.state(['!disabled'])
-        else:
-            self.terminate_btn.state(['disabled'])
+        state = ['!disabled'] if sel else ['disabled']
+        self.terminate_btn.state(state)
+        self.kill_tree_btn.state(state)
 
     def _on_process_double_click(self, event):
         # show details of selected process
@@ -330,31 +1126,69 @@ class SystemMonitorGUI:
         except Exception as e:
             messagebox.showerror('Error', f'Could not read process info: {e}')
 
+    def _selected_pids(self):
+        pids = []
+        for item in self.tree.selection():
+            try:
+                pids.append(int(self.tree.item(item, 'values')[0]))
+            except (IndexError, ValueError):
+                continue
+        return pids
+
     def terminate_selected_process(self):
-        sel = self.tree.selection()
-        if not sel:
+        self._terminate_selected(include_children=False)
+
+    def kill_selected_tree(self):
+        self._terminate_selected(include_children=True)
+
+    def _terminate_selected(self, include_children):
+        pids = self._selected_pids()
+        if not pids:
             return
-        item = sel[0]
-        pid = int(self.tree.item(item, 'values')[0])
-        if not messagebox.askyesno('Confirm terminate', f'Are you sure you want to terminate PID {pid}?'):
+        what = 'kill the process tree of' if include_children else 'terminate'
+        listed = ', '.join(str(p) for p in pids[:10]) + (' ...' if len(pids) > 10 else '')
+        if not messagebox.askyesno('Confirm terminate', f'Are you sure you want to {what} PID(s) {listed}?'):
             return
         try:
-            proc = psutil.Process(pid)
-            proc.terminate()
-            proc.wait(timeout=3)
-            messagebox.showinfo('Terminated', f'Process {pid} terminated successfully (or asked to terminate).')
-            # refresh view immediately
-            self.update_stats_now()
-        except psutil.NoSuchProcess:
-            messagebox.showinfo('Already gone', 'Process no longer exists.')
-            self.update_stats_now()
-        except psutil.AccessDenied:
-            messagebox.showerror('Permission denied', 'Permission denied. Try running the app with elevated privileges.')
-        except Exception as e:
-            messagebox.showerror('Error', f'Could not terminate process: {e}')
+            grace = max(0.0, float(self.grace_period_s.get()))
+        except Exception:
+            grace = 3.0
+
+        def on_done(results):
+            self.ui_queue.put(lambda: self._on_terminate_done(results))
+
+        terminate_in_background(pids, on_done, include_children=include_children, grace_period=grace)
+        self.status.config(text=f'Terminating {len(pids)} process(es) in background...')
+
+    def _on_terminate_done(self, results):
+        lines = [f'PID {pid}: {status}' for pid, status in sorted(results.items())]
+        failed = [s for s in results.values() if s not in ('terminated', 'killed', 'already gone')]
+        summary = '\n'.join(lines[:40]) + (f'\n... and {len(lines) - 40} more' if len(lines) > 40 else '')
+        if not lines:
+            summary = 'Nothing to terminate.'
+        if any(s == 'access denied' for s in failed):
+            summary += '\n\nSome processes need elevated privileges.'
+        if failed:
+            messagebox.showwarning('Terminate results', summary)
+        else:
+            messagebox.showinfo('Terminate results', summary)
+        # refresh view immediately
+        self.update_stats_now()
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='System Diagnostics & Monitoring Tool')
+    parser.add_argument('--metrics-port', type=int, help='serve Prometheus metrics on this port')
+    parser.add_argument('--metrics-host', default='127.0.0.1', help='address to bind the metrics endpoint to')
+    args = parser.parse_args()
+
+    server = None
+    if args.metrics_port is not None:
+        server = MetricsServer(args.metrics_host, args.metrics_port).start()
+        print(f'Serving metrics on {server.url}')
+
     root = tk.Tk()
-    app = SystemMonitorGUI(root)
+    app = SystemMonitorGUI(root, metrics_server=server)
     root.mainloop()
+    if server is not None:
+        server.stop()
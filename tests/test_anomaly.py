@@ -0,0 +1,88 @@
+from collections import namedtuple
+
+import pytest
+
+from anomaly import AnomalyDetector, EwmaBaseline, ProcessDeltaTracker
+
+CpuTimes = namedtuple('CpuTimes', 'user system')
+MemInfo = namedtuple('MemInfo', 'rss')
+
+
+def _info(pid, cpu_s, rss=1 << 20, create_time=100.0, cpu_num=None, name=None):
+    return {'pid': pid, 'name': name or f'proc{pid}', 'create_time': create_time, 'cpu_num': cpu_num,
+            'cpu_times': CpuTimes(cpu_s, 0.0), 'memory_info': MemInfo(rss)}
+
+
+def test_ewma_converges_and_returns_previous_baseline():
+    baseline = EwmaBaseline(alpha=0.1)
+    assert baseline.update(80.0) == (80.0, 0.0)
+    for _ in range(200):
+        baseline.update(80.0)
+    assert baseline.mean == pytest.approx(80.0)
+    assert baseline.std == pytest.approx(0.0)
+    mean, std = baseline.update(90.0)
+    assert (mean, std) == (pytest.approx(80.0), pytest.approx(0.0))
+    # mean moves by alpha * diff, variance by (1 - alpha) * alpha * diff^2
+    assert baseline.mean == pytest.approx(81.0)
+    assert baseline.var == pytest.approx(0.9 * 0.1 * 100.0)
+
+
+def test_spike_fires_once_and_clears():
+    detector = AnomalyDetector(alpha=0.05, z_threshold=3.0, clear_z=1.5, warmup=30, min_std=1.0)
+    raised = []
+    for i in range(60):
+        raised += detector.update({'cpu': 80.0 + (0.5 if i % 2 else -0.5)})
+    assert raised == []
+
+    # stays anomalous for several ticks but is reported only on the first
+    for _ in range(3):
+        raised += detector.update({'cpu': 99.0})
+    assert [a['metric'] for a in raised] == ['cpu']
+    assert raised[0]['z'] >= 3.0
+    assert 'cpu' in detector.active
+
+    # back to normal drops it under clear_z; once the spike has faded from the
+    # variance a new one is reported again
+    detector.update({'cpu': 80.0})
+    assert 'cpu' not in detector.active
+    for i in range(200):
+        detector.update({'cpu': 80.0 + (0.5 if i % 2 else -0.5)})
+    assert [a['metric'] for a in detector.update({'cpu': 99.0})] == ['cpu']
+
+
+def test_no_alerts_during_warmup():
+    detector = AnomalyDetector(warmup=30)
+    raised = []
+    for i in range(29):
+        raised += detector.update({'cpu': 99.0 if i == 20 else 80.0})
+    assert raised == []
+
+
+def test_process_deltas_and_culprits():
+    tracker = ProcessDeltaTracker()
+    tracker.update([_info(1, 10.0), _info(2, 5.0), _info(3, 1.0, rss=1 << 20)], now=0.0)
+    tracker.update([_info(1, 10.5), _info(2, 6.0), _info(3, 1.0, rss=3 << 20)], now=1.0)
+    culprits = tracker.culprits('cpu')
+    assert [(pid, round(delta)) for pid, _name, delta, _share in culprits] == [(2, 100), (1, 50)]
+    assert culprits[0][3] == pytest.approx(2 / 3)
+    assert tracker.culprits('mem_pct') == [(3, 'proc3', 2 << 20, 1.0)]
+    assert tracker.culprits('net_recv') == []
+
+
+def test_reused_pid_gets_no_delta():
+    tracker = ProcessDeltaTracker()
+    tracker.update([_info(7, 500.0, create_time=100.0)], now=0.0)
+    # pid 7 exited and was reused by a new process with little CPU time
+    tracker.update([_info(7, 0.2, create_time=105.0, name='new')], now=1.0)
+    assert tracker.deltas == {}
+    tracker.update([_info(7, 0.7, create_time=105.0, name='new')], now=2.0)
+    assert tracker.culprits('cpu') == [(7, 'new', pytest.approx(50.0), 1.0)]
+
+
+def test_per_core_culprits_only_count_that_core():
+    tracker = ProcessDeltaTracker()
+    tracker.update([_info(1, 0.0, cpu_num=0), _info(2, 0.0, cpu_num=1), _info(3, 0.0)], now=0.0)
+    tracker.update([_info(1, 0.9, cpu_num=0), _info(2, 0.3, cpu_num=1), _info(3, 0.5)], now=1.0)
+    assert [c[0] for c in tracker.culprits('cpu')] == [1, 3, 2]
+    assert [c[0] for c in tracker.culprits('cpu_core_1')] == [2]
+    assert tracker.culprits('cpu_core_5') == []
@@ -0,0 +1,96 @@
+import os
+import shutil
+
+from cgroups import CgroupCollector, friendly_name
+
+
+def _make(root, rel, descendants=0, usage_usec=0):
+    path = os.path.join(root, rel)
+    os.makedirs(path, exist_ok=True)
+    _set_descendants(root, rel, descendants)
+    with open(os.path.join(path, 'cpu.stat'), 'w') as f:
+        f.write(f'usage_usec {usage_usec}\n')
+    with open(os.path.join(path, 'cgroup.procs'), 'w') as f:
+        f.write('')
+
+
+def _set_descendants(root, rel, count):
+    # the change signal cgroupfs maintains (directory mtimes are not updated)
+    with open(os.path.join(root, rel, 'cgroup.stat'), 'w') as f:
+        f.write(f'nr_descendants {count}\nnr_dying_descendants 0\n')
+
+
+def _tree(tmp_path):
+    root = str(tmp_path)
+    _make(root, '', descendants=3)
+    _make(root, 'system.slice', descendants=1)
+    _make(root, 'system.slice/sshd.service')
+    _make(root, 'user.slice')
+    return root
+
+
+def test_child_created_after_construction(tmp_path):
+    root = _tree(tmp_path)
+    collector = CgroupCollector(root=root)
+    collector.sample()
+    assert collector.rescans == 1
+
+    # nothing changed: no rescan
+    collector.sample()
+    assert collector.rescans == 1
+
+    _make(root, 'system.slice/docker-0123456789abcdef0123.scope')
+    _set_descendants(root, 'system.slice', 2)
+    _set_descendants(root, '', 4)
+    stats = collector.sample()
+    assert 'system.slice/docker-0123456789abcdef0123.scope' in collector.dirs
+    assert stats['system.slice/docker-0123456789abcdef0123.scope']['name'] == 'docker:0123456789ab'
+    # only system.slice was re-walked, not the whole tree
+    assert collector.rescans == 2
+    assert len(collector.dirs) == 5
+
+
+def test_child_removed(tmp_path):
+    root = _tree(tmp_path)
+    collector = CgroupCollector(root=root)
+    collector.sample()
+
+    shutil.rmtree(os.path.join(root, 'system.slice', 'sshd.service'))
+    _set_descendants(root, 'system.slice', 0)
+    _set_descendants(root, '', 2)
+    stats = collector.sample()
+    assert 'system.slice/sshd.service' not in collector.dirs
+    assert 'system.slice/sshd.service' not in stats
+
+
+def test_periodic_full_rescan(tmp_path):
+    root = _tree(tmp_path)
+    collector = CgroupCollector(root=root, full_rescan_s=0)
+    # a create that leaves every count unchanged is still found by the full rescan
+    _make(root, 'user.slice/user-1000.slice')
+    collector.sample()
+    assert 'user.slice/user-1000.slice' in collector.dirs
+
+
+def test_friendly_name():
+    assert friendly_name('') == '(root)'
+    assert friendly_name('system.slice/nginx.service') == 'nginx'
+    assert friendly_name('kubepods/pod1/cri-containerd-abcdef0123456789.scope') == 'containerd:abcdef012345'
+
+
+def test_pid_map_refreshes_on_cadence(tmp_path):
+    root = _tree(tmp_path)
+    with open(os.path.join(root, 'system.slice', 'sshd.service', 'cgroup.procs'), 'w') as f:
+        f.write('101\n102\n')
+    collector = CgroupCollector(root=root, pid_refresh_s=3600)
+    collector.update_pids()
+    assert collector.cgroup_of(101) == 'system.slice/sshd.service'
+    assert collector.cgroup_of(999) is None
+
+    with open(os.path.join(root, 'user.slice', 'cgroup.procs'), 'w') as f:
+        f.write('999\n')
+    collector.update_pids()
+    assert collector.cgroup_of(999) is None  # not due yet
+    collector.pid_refresh_s = 0
+    collector.update_pids()
+    assert friendly_name(collector.cgroup_of(999)) == 'user'
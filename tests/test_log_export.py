@@ -0,0 +1,81 @@
+import datetime
+import os
+import threading
+
+import pytest
+
+import log_export
+from log_export import ExportCancelled, export_in_background, export_rows, filter_rows, iter_csv_log
+
+
+def _write_log(path, rows=20000):
+    start = datetime.datetime(2024, 1, 1)
+    with open(path, 'w', newline='') as f:
+        f.write('Timestamp,CPU %,RAM %\n')
+        for i in range(rows):
+            if i == rows // 2:
+                f.write('Timestamp,CPU %,RAM %\n')  # header repeated by "Start Logging"
+            f.write(f'{(start + datetime.timedelta(seconds=i)).isoformat()},{i % 100}.0,50.0\n')
+
+
+def test_export_csv_filters_range_and_columns(tmp_path):
+    log = str(tmp_path / 'system_log.csv')
+    out = str(tmp_path / 'out.csv')
+    _write_log(log, rows=100)
+    rows = filter_rows(iter_csv_log(log), ['Timestamp', 'CPU %'],
+                       start=datetime.datetime(2024, 1, 1, 0, 0, 10),
+                       end=datetime.datetime(2024, 1, 1, 0, 0, 19), timestamp_key='Timestamp')
+    assert export_rows(rows, out, 'csv', ['Timestamp', 'CPU %']) == 10
+    with open(out) as f:
+        lines = f.read().splitlines()
+    assert lines[0] == 'Timestamp,CPU %'
+    assert lines[1] == '2024-01-01T00:00:10,10.0'
+
+
+def test_cancel_when_filter_matches_nothing(tmp_path, monkeypatch):
+    log = str(tmp_path / 'system_log.csv')
+    out = str(tmp_path / 'out.jsonl')
+    _write_log(log)
+    progress = []
+    done = threading.Event()
+    result = {}
+
+    def on_progress(count, fraction):
+        progress.append(fraction)
+        cancel_event.set()
+
+    def on_done(count, error):
+        result.update(count=count, error=error)
+        done.set()
+
+    ready = threading.Event()
+    original = log_export.iter_csv_log
+
+    def gated(*args, **kwargs):
+        # don't start reading until cancel_event is known here
+        ready.wait()
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(log_export, 'iter_csv_log', gated)
+    _thread, cancel_event = export_in_background(log, out, 'jsonl', ['Timestamp', 'CPU %'],
+                                                 start=datetime.datetime(2030, 1, 1),
+                                                 on_progress=on_progress, on_done=on_done)
+    ready.set()
+    assert done.wait(10)
+
+    assert isinstance(result['error'], ExportCancelled)
+    assert result['count'] == 0
+    assert progress and progress[0] < 1.0
+    assert not os.path.exists(out)
+
+
+def test_xlsx_continues_on_new_sheet(tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip('openpyxl')
+    monkeypatch.setattr(log_export, 'XLSX_MAX_ROWS', 4)
+    out = str(tmp_path / 'out.xlsx')
+    rows = [{'n': i} for i in range(7)]
+    assert export_rows(iter(rows), out, 'xlsx', ['n']) == 7
+    wb = openpyxl.load_workbook(out, read_only=True)
+    assert wb.sheetnames == ['log', 'log 2', 'log 3']
+    values = [[r[0] for r in wb[name].iter_rows(values_only=True)] for name in wb.sheetnames]
+    assert values == [['n', 0, 1, 2], ['n', 3, 4, 5], ['n', 6]]
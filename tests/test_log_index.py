@@ -0,0 +1,49 @@
+import datetime
+
+import pytest
+
+from log_index import LogIndex
+
+START = datetime.datetime(2024, 1, 1)
+
+
+def _write_log(path, rows, spike_at=None):
+    with open(path, 'w', newline='') as f:
+        f.write('Timestamp,CPU %,RAM %\n')
+        for i in range(rows):
+            if i == rows // 3:
+                f.write('Timestamp,CPU %,RAM %\n')  # header repeated by "Start Logging"
+            cpu = 99.0 if i == spike_at else 20.0 + (i % 5)
+            f.write(f'{(START + datetime.timedelta(seconds=i)).isoformat()},{cpu},50.0\n')
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / 'system_log.csv')
+    _write_log(path, rows=20000, spike_at=12345)
+    idx = LogIndex(path, block_rows=64)
+    idx.build()
+    yield idx
+    idx.close()
+
+
+def test_build_skips_repeated_header(index):
+    assert index.rows == 20000
+    assert index.numeric_columns == ['CPU %', 'RAM %']
+    assert index.time_range == (START.timestamp(), (START + datetime.timedelta(seconds=19999)).timestamp())
+
+
+def test_single_row_spike_survives_full_range(index):
+    xs, ys = index.query(['CPU %'], buckets=100)['CPU %']
+    assert len(xs) <= 2 * 100
+    assert max(ys) == 99.0
+    assert xs[ys.index(99.0)] == (START + datetime.timedelta(seconds=12345)).timestamp()
+    assert min(ys) == 20.0
+    assert xs == sorted(xs)
+
+
+def test_zoomed_query_reads_rows(index):
+    t0 = (START + datetime.timedelta(seconds=12340)).timestamp()
+    xs, ys = index.query(['CPU %'], start=t0, end=t0 + 9, buckets=1000)['CPU %']
+    assert xs == [t0 + i for i in range(10)]
+    assert ys[5] == 99.0
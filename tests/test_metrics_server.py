@@ -0,0 +1,69 @@
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import metrics_server
+from metrics_server import CONTENT_TYPE, MetricsServer, render_metrics
+
+SNAPSHOT = {
+    'timestamp': 1700000000.5,
+    'cpu': 12.5,
+    'per_cpu': [10.0, 15.0],
+    'memory': {'total': 8 << 30, 'available': 4 << 30, 'used': 4 << 30, 'free': 2 << 30, 'percent': 50.0},
+    'disk_path': '/',
+    'disk': {'total': 100 << 30, 'used': 40 << 30, 'free': 60 << 30, 'percent': 40.0},
+    'network': {'lo': {'bytes_sent': 10, 'bytes_recv': 20, 'packets_sent': 1, 'packets_recv': 2,
+                       'errout': 0, 'errin': 0}},
+    'disk_io': {},
+    'processes': [{'pid': 42, 'name': 'python', 'cpu_percent': 3.0, 'memory_percent': 1.5}],
+}
+
+
+@pytest.fixture
+def server():
+    srv = MetricsServer(port=0).start()
+    yield srv
+    srv.stop()
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return resp.headers['Content-Type'], resp.read()
+
+
+def test_serves_published_snapshot(server):
+    server.publish(SNAPSHOT)
+    content_type, body = _get(server.url)
+    assert content_type == CONTENT_TYPE
+    assert body == render_metrics(SNAPSHOT).encode('utf-8')
+    text = body.decode()
+    assert 'sysmon_cpu_percent 12.5' in text
+    assert 'sysmon_cpu_core_percent{core="1"} 15.0' in text
+    assert 'sysmon_memory_bytes{kind="total"} 8589934592' in text
+    assert 'sysmon_process_cpu_percent{pid="42",name="python"} 3.0' in text
+
+
+def test_other_paths_are_404(server):
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _get(f'http://{server.host}:{server.port}/')
+    assert exc.value.code == 404
+
+
+def test_label_values_are_escaped():
+    snapshot = {'processes': [{'pid': 1, 'name': 'a"b\\c\nd', 'cpu_percent': 1.0}]}
+    assert 'name="a\\"b\\\\c\\nd"' in render_metrics(snapshot)
+
+
+def test_concurrent_scrapes_use_cached_payload(server, monkeypatch):
+    server.publish(SNAPSHOT)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('scrape triggered a collection')
+
+    monkeypatch.setattr(metrics_server, 'collect_snapshot', fail)
+    monkeypatch.setattr(metrics_server, 'render_metrics', fail)
+    with ThreadPoolExecutor(8) as pool:
+        bodies = set(body for _type, body in pool.map(_get, [server.url] * 32))
+    assert bodies == {server.payload()}
@@ -0,0 +1,57 @@
+import os
+from collections import namedtuple
+
+from recorder import Recording, SnapshotRecorder
+
+MemInfo = namedtuple('MemInfo', 'rss')
+
+
+def _proc(pid, cpu=0.0, rss=1 << 20, name=None):
+    return {'pid': pid, 'name': name or f'proc{pid}', 'username': 'root', 'status': 'sleeping',
+            'cpu_percent': cpu, 'memory_percent': 0.5, 'memory_info': MemInfo(rss), 'num_threads': 1}
+
+
+def _record(path, ticks=12, keyframe_interval=5):
+    states = []
+    with SnapshotRecorder(path, keyframe_interval=keyframe_interval) as rec:
+        for t in range(ticks):
+            # pid 1 lives throughout, pid 100 + t appears each tick, pid 2 exits half way
+            procs = [_proc(1, cpu=float(t)), _proc(100 + t)]
+            if t < ticks // 2:
+                procs.append(_proc(2, rss=(1 << 20) + t * 4096))
+            rec.record({'cpu': float(t), 'mem_pct': 50.0}, procs, timestamp=1000.0 + t)
+            states.append(procs)
+    return states
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'rec.smrec')
+    states = _record(path)
+    rec = Recording(path)
+    try:
+        assert len(rec) == 12
+        # random access, including backwards across keyframes
+        for index in (11, 0, 7, 3, 10):
+            frame = rec.frame(index)
+            assert frame['t'] == 1000.0 + index
+            assert frame['sys']['cpu'] == float(index)
+            assert set(frame['procs']) == {p['pid'] for p in states[index]}
+            assert frame['procs'][1]['cpu'] == float(index)
+        assert rec.index_at(1004.5) == 4
+        assert rec.timestamp(9) == 1009.0
+    finally:
+        rec.close()
+
+
+def test_truncated_tail_is_dropped(tmp_path):
+    path = str(tmp_path / 'rec.smrec')
+    _record(path, ticks=12, keyframe_interval=5)
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 5)
+    rec = Recording(path)
+    try:
+        # the last segment (ticks 10-11) is incomplete and must not be indexed
+        assert len(rec) == 10
+        assert rec.frame(9)['t'] == 1009.0
+    finally:
+        rec.close()